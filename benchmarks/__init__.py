@@ -0,0 +1 @@
+# Benchmarks for the News Aggregator (run from the repo root with `python -m benchmarks.<name>`)
@@ -0,0 +1,106 @@
+"""
+Benchmark ContentFilter.find_duplicates against the old pairwise implementation
+
+Usage:
+    python -m benchmarks.bench_dedup --sizes 10000,100000 --legacy-max 1000
+
+The pairwise SequenceMatcher scan is quadratic, so it only runs up to
+--legacy-max titles; above that its time is extrapolated from the largest
+measured size. Where both ran, "differ" counts the indices only one of them
+reported. LSH recall is probabilistic (a similar pair may share no bucket),
+so this is not guaranteed to be zero.
+
+find_duplicates is not linear either: the number of LSH candidates per title
+grows with the corpus, because titles built from common words share some
+buckets by chance. --profile prints where its time goes at each size.
+"""
+
+import argparse
+import cProfile
+import logging
+import pstats
+import time
+from difflib import SequenceMatcher
+from typing import List
+
+from benchmarks.synthetic import make_titles
+from src.filters import ContentFilter
+from src.models import ArticleRecord
+
+
+def legacy_find_duplicates(articles: List[ArticleRecord], threshold: float = 0.75) -> List[int]:
+    """The original O(n^2) pairwise scan, kept as the reference"""
+    duplicates = set()
+    n = len(articles)
+
+    for i in range(n):
+        if i in duplicates:
+            continue
+        title1 = articles[i].title
+        url1 = articles[i].url
+
+        for j in range(i + 1, n):
+            if j in duplicates:
+                continue
+            if url1 == articles[j].url:
+                duplicates.add(j)
+                continue
+            title2 = articles[j].title
+            if SequenceMatcher(None, title1.lower(), title2.lower()).ratio() >= threshold:
+                duplicates.add(j)
+
+    return list(duplicates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated corpus sizes")
+    parser.add_argument("--legacy-max", type=int, default=1000, help="Largest size to run the pairwise scan on")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2, help="Share of titles that are rewrites")
+    parser.add_argument("--profile", action="store_true", help="Print the top functions of each find_duplicates run")
+    args = parser.parse_args()
+
+    logging.getLogger("src.filters.content_filter").setLevel(logging.WARNING)
+    content_filter = ContentFilter()
+
+    print(f"{'titles':>8} {'lsh (s)':>9} {'pairwise (s)':>13} {'speedup':>8} {'dups':>7} {'differ':>7}")
+
+    legacy_rate = None
+    for size in [int(s) for s in args.sizes.split(",")]:
+        articles = [
+            ArticleRecord(title=title, url=f"https://example.com/{i}")
+            for i, title in enumerate(make_titles(size, args.duplicate_rate))
+        ]
+
+        profiler = cProfile.Profile() if args.profile else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        found = set(content_filter.find_duplicates(articles))
+        if profiler:
+            profiler.disable()
+        lsh_time = time.perf_counter() - start
+
+        differ = "-"
+        if size <= args.legacy_max:
+            start = time.perf_counter()
+            expected = set(legacy_find_duplicates(articles, content_filter.similarity_threshold))
+            legacy_time = time.perf_counter() - start
+            legacy_rate = legacy_time / (size * size)
+            differ = str(len(found ^ expected))
+            legacy_label = f"{legacy_time:.2f}"
+        elif legacy_rate is not None:
+            legacy_time = legacy_rate * size * size
+            legacy_label = f"~{legacy_time:.0f}"
+        else:
+            legacy_time = None
+            legacy_label = "-"
+
+        speedup = f"{legacy_time / lsh_time:.0f}x" if legacy_time else "-"
+        print(f"{size:>8} {lsh_time:>9.2f} {legacy_label:>13} {speedup:>8} {len(found):>7} {differ:>7}")
+        if profiler:
+            pstats.Stats(profiler).sort_stats("tottime").print_stats(8)
+
+
+if __name__ == "__main__":
+    main()
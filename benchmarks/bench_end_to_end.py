@@ -0,0 +1,205 @@
+"""
+End-to-end benchmark: fetch -> filter -> summarize -> save -> WhatsApp, offline
+
+Usage:
+    python -m benchmarks.bench_end_to_end --articles 100,1000,10000 --api-latency 0.05
+
+For each scale a synthetic corpus (near-duplicate rewrites, clickbait,
+sponsored and repeated-URL articles mixed in) is published through the feed
+stubs in benchmarks/stubs.py, which render it in the shape of the recorded
+feeds in benchmarks/fixtures. Each stage then runs on its own against the
+stubs and a fresh SQLite file:
+
+    fetch      RSSFetcher.iter_sources over the stub feeds
+    filter     ContentFilter.filter_articles
+    summarize  AISummarizer.summarize_batch against the Anthropic stub
+    save       save_articles
+    whatsapp   WhatsAppNotifier.send_daily_digest against the Twilio stub
+
+and reports articles (or messages) per second and the peak memory allocated
+above what was held when the stage started. Memory is traced with
+tracemalloc, which slows Python code down; pass --no-memory for throughput
+numbers closer to a real run. --pipeline also streams the whole corpus
+through StreamingPipeline on another fresh database, and --metrics-report
+writes the run's per-source/per-stage counters (see src/metrics) as JSON.
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.stubs import StubServer, use_twilio_stub
+from benchmarks.synthetic import make_corpus
+from src.aggregator import RSSFetcher
+from src.filters import ContentFilter
+from src.metrics import metrics
+from src.models import Database, save_articles
+from src.pipeline import StreamingPipeline
+from src.summarizer import AISummarizer
+
+
+class StageTimer:
+    """Wall time and peak traced memory of each stage of one run"""
+
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.results = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str, items=None):
+        """Time the block; items is a callable returning how many items it processed"""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - baseline if self.trace_memory else None
+        self.results.append((name, items(), elapsed, peak))
+
+    def print(self):
+        mb = 1024 * 1024
+        print(f"{'stage':>10} {'items':>8} {'time (s)':>9} {'items/s':>10} {'peak MB':>8}")
+        for name, items, elapsed, peak in self.results:
+            peak_text = f"{peak / mb:>8.1f}" if peak is not None else f"{'-':>8}"
+            print(f"{name:>10} {items:>8} {elapsed:>9.2f} {items / elapsed if elapsed else 0:>10.0f} {peak_text}")
+
+
+def make_notifier(base_url: str):
+    """A WhatsAppNotifier with placeholder credentials, sending to the Twilio stub"""
+    from src.utils import WhatsAppNotifier
+
+    os.environ.update({
+        "TWILIO_ACCOUNT_SID": "AC" + "0" * 32,
+        "TWILIO_AUTH_TOKEN": "bench",
+        "TWILIO_WHATSAPP_FROM": "whatsapp:+15550000000",
+        "TWILIO_WHATSAPP_TO": "whatsapp:+15550000001",
+    })
+    notifier = WhatsAppNotifier()
+    use_twilio_stub(notifier, base_url)
+    return notifier
+
+
+def run_stages(args, stubs: StubServer, workdir: str) -> StageTimer:
+    sources = stubs.feed_sources()
+    per_source = -(-len(stubs.articles) // len(sources))
+    timer = StageTimer(trace_memory=not args.no_memory)
+
+    fetcher = RSSFetcher(max_workers=args.fetch_workers)
+    articles = []
+    with timer.stage("fetch", lambda: len(articles)):
+        for batch in fetcher.iter_sources(sources, max_per_source=per_source):
+            articles.extend(batch)
+
+    kept = []
+    with timer.stage("filter", lambda: len(articles)):
+        kept = ContentFilter(workers=args.filter_workers).filter_articles(articles)
+
+    count = len(kept) if args.max_summarize == 0 else min(args.max_summarize, len(kept))
+    summarizer = AISummarizer(
+        api_key="bench",
+        base_url=stubs.base_url,
+        max_retries=0,
+        max_concurrency=args.summarize_concurrency,
+        batch_token_budget=args.batch_token_budget,
+    )
+    with timer.stage("summarize", lambda: count):
+        summarizer.summarize_batch(kept, max_articles=count)
+
+    database = Database(f"sqlite:///{workdir}/stages.db")
+    database.create_tables()
+    with timer.stage("save", lambda: len(kept)):
+        for start in range(0, len(kept), args.save_batch_size):
+            save_articles(database, kept[start:start + args.save_batch_size])
+
+    notifier = make_notifier(stubs.base_url)
+    sent = lambda: int(sum(metrics.report()["counters"].get("whatsapp_messages", {}).values()))
+    already_sent = sent()
+    with timer.stage("whatsapp", lambda: sent() - already_sent):
+        # The notifier prints every message it sends
+        with contextlib.redirect_stdout(io.StringIO()):
+            notifier.send_daily_digest(kept[:count], limit=args.whatsapp_limit)
+
+    return timer
+
+
+def run_pipeline(args, stubs: StubServer, workdir: str, timer: StageTimer) -> dict:
+    """Time a StreamingPipeline run over the whole corpus; returns its counts"""
+    sources = stubs.feed_sources()
+    per_source = -(-len(stubs.articles) // len(sources))
+
+    database = Database(f"sqlite:///{workdir}/pipeline.db")
+    database.create_tables()
+    summarizer = AISummarizer(
+        api_key="bench",
+        base_url=stubs.base_url,
+        max_retries=0,
+        max_concurrency=args.summarize_concurrency,
+        batch_token_budget=args.batch_token_budget,
+    )
+    pipeline = StreamingPipeline(
+        database,
+        ContentFilter(),
+        summarizer=summarizer,
+        max_summarize=args.max_summarize or len(stubs.articles),
+        summarize_chunk_size=args.summarize_concurrency * 2,
+        save_batch_size=args.save_batch_size,
+    )
+
+    result = {}
+    with timer.stage("pipeline", lambda: result["fetched"]):
+        result = pipeline.run(RSSFetcher(max_workers=args.fetch_workers).iter_sources(sources, max_per_source=per_source))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", default="100,1000,10000", help="Comma-separated corpus sizes")
+    parser.add_argument("--sources", type=int, default=12, help="Feeds the corpus is spread over")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2, help="Share of titles that are rewrites")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds the Anthropic and Twilio stubs take per request")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="RSSFetcher max_workers")
+    parser.add_argument("--filter-workers", type=int, default=1, help="ContentFilter workers")
+    parser.add_argument("--max-summarize", type=int, default=0, help="Articles summarized (0 = every kept article)")
+    parser.add_argument("--summarize-concurrency", type=int, default=4, help="AISummarizer max_concurrency")
+    parser.add_argument("--batch-token-budget", type=int, default=0, help="AISummarizer batch_token_budget (0 = one article per request)")
+    parser.add_argument("--save-batch-size", type=int, default=100, help="Articles per save_articles transaction")
+    parser.add_argument("--whatsapp-limit", type=int, default=20, help="Articles in the WhatsApp digest")
+    parser.add_argument("--pipeline", action="store_true", help="Also time a StreamingPipeline run over the whole corpus")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory column)")
+    parser.add_argument("--metrics-report", help="Write the collected metrics of the last scale to this JSON file")
+    args = parser.parse_args()
+
+    logging.getLogger("src").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("twilio").setLevel(logging.WARNING)
+    if not args.no_memory:
+        tracemalloc.start()
+
+    for scale in [int(n) for n in args.articles.split(",")]:
+        corpus = make_corpus(scale, args.duplicate_rate)
+        metrics.reset()
+
+        with StubServer(corpus, source_count=args.sources, latency=args.api_latency) as stubs, \
+                tempfile.TemporaryDirectory() as workdir:
+            print(f"\n{scale} articles over {min(args.sources, scale)} feeds")
+            timer = run_stages(args, stubs, workdir)
+            result = run_pipeline(args, stubs, workdir, timer) if args.pipeline else None
+        timer.print()
+        if result is not None:
+            print(
+                f"pipeline: {result['fetched']} fetched, {result['filtered']} kept, "
+                f"{result['summarized']} summarized, {result['saved']} saved"
+            )
+
+    if args.metrics_report:
+        metrics.write_report(args.metrics_report)
+
+
+if __name__ == "__main__":
+    main()
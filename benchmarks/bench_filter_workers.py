@@ -0,0 +1,61 @@
+"""
+Benchmark ContentFilter.filter_articles across process pool sizes
+
+Usage:
+    python -m benchmarks.bench_filter_workers --articles 50000 --workers 1,2,4,8
+
+Filters the same synthetic corpus (with some clickbait, sponsored and
+repeated-URL articles mixed in) with each worker count and checks that every
+run keeps the same articles and marks the rest the same way as the serial
+run. Speedup is bounded by the CPU count printed first. Exits non-zero if
+any run differs from the serial one.
+"""
+
+import argparse
+import copy
+import logging
+import os
+import sys
+import time
+
+from benchmarks.synthetic import make_corpus
+from src.filters import ContentFilter
+
+
+def verdicts(articles):
+    return [(a.is_filtered, a.is_duplicate, a.filter_reason) for a in articles]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=50000, help="Articles to filter")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2, help="Share of titles that are rewrites")
+    args = parser.parse_args()
+
+    logging.getLogger("src.filters.content_filter").setLevel(logging.WARNING)
+    corpus = make_corpus(args.articles, args.duplicate_rate)
+    print(f"CPUs: {os.cpu_count()}, articles: {args.articles}\n")
+    print(f"{'workers':>8} {'time (s)':>9} {'speedup':>8} {'kept':>7} {'identical':>10}")
+
+    baseline = None
+    identical = True
+    for workers in [int(w) for w in args.workers.split(",")]:
+        articles = copy.deepcopy(corpus)
+        start = time.perf_counter()
+        kept = ContentFilter(workers=workers).filter_articles(articles)
+        elapsed = time.perf_counter() - start
+
+        result = ([a.url for a in kept], verdicts(articles))
+        if baseline is None:
+            baseline = (elapsed, result)
+
+        identical = identical and result == baseline[1]
+        print(f"{workers:>8} {elapsed:>9.2f} {baseline[0] / elapsed:>7.2f}x {len(kept):>7} "
+              f"{str(result == baseline[1]):>10}")
+
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark ContentFilter.is_clickbait / is_low_quality per article
+
+Usage:
+    python -m benchmarks.bench_quality_filters --articles 2000 --content-kb 50
+
+Compares the compiled single-pass matchers with the original per-pattern
+loops on long HTML content bodies, and checks that both flag the same
+articles.
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from benchmarks.synthetic import make_articles
+from src.filters import ContentFilter
+
+
+def legacy_is_clickbait(patterns: List[str], title: str) -> bool:
+    """Original check: one re.search per pattern"""
+    title_lower = title.lower()
+    return any(re.search(pattern, title_lower) for pattern in patterns)
+
+
+def legacy_is_low_quality(keywords: List[str], article) -> bool:
+    """Original check: lowercase and concatenate every field, then scan once per keyword"""
+    title = article.title.lower()
+    content = article.content.lower()
+    description = article.description.lower()
+
+    combined_text = f"{title} {content} {description}"
+    if any(keyword in combined_text for keyword in keywords):
+        return True
+
+    return len(content) < 100 and len(description) < 100
+
+
+def html_body(rng: random.Random, text: str, size: int) -> str:
+    """Wrap text in feed-style HTML markup until it reaches roughly size characters"""
+    parts = []
+    length = 0
+    while length < size:
+        paragraph = f'<p class="article-body"><a href="https://example.com/{rng.randrange(10**6)}">{text}</a></p>'
+        parts.append(paragraph)
+        length += len(paragraph)
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=2000, help="Number of articles")
+    parser.add_argument("--content-kb", type=int, default=50, help="Approximate HTML content size per article (KB)")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    articles = make_articles(args.articles)
+    for article in articles:
+        article.content = html_body(rng, article.content, args.content_kb * 1024)
+        if rng.random() < 0.05:
+            article.description += " Sponsored content"
+        elif rng.random() < 0.01:
+            # A keyword split across the title and content still counts
+            article.title += " Paid"
+            article.content = "promotion " + article.content
+
+    content_filter = ContentFilter()
+    patterns = content_filter.clickbait_patterns
+    keywords = content_filter.low_quality_keywords
+
+    start = time.perf_counter()
+    legacy = [
+        legacy_is_clickbait(patterns, a.title) or legacy_is_low_quality(keywords, a)
+        for a in articles
+    ]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [
+        content_filter.is_clickbait(a.title) or content_filter.is_low_quality(a)
+        for a in articles
+    ]
+    compiled_time = time.perf_counter() - start
+
+    per_article = 1e6 / len(articles)
+    print(f"articles: {len(articles)}, content: ~{args.content_kb} KB HTML each, flagged: {sum(compiled)}")
+    print(f"original loops:    {legacy_time * per_article:8.1f} us/article")
+    print(f"compiled matcher:  {compiled_time * per_article:8.1f} us/article")
+    print(f"speedup:           {legacy_time / compiled_time:8.1f}x")
+    print(f"identical results: {legacy == compiled}")
+
+
+if __name__ == "__main__":
+    main()
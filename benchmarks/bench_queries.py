@@ -0,0 +1,120 @@
+"""
+Benchmark the view / cleanup / stats queries with and without the Article indexes
+
+Usage:
+    python -m benchmarks.bench_queries --rows 2000000
+
+Builds a SQLite file of synthetic articles, drops the query indexes, times
+each query and prints its plan, then creates the indexes and repeats.
+The cleanup query is timed as a COUNT over the same predicate so the
+table is left unchanged between runs.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from src.models import Article, Database
+
+QUERIES = {
+    "view all": (
+        "SELECT id, title, summary FROM articles WHERE is_filtered = 0 "
+        "ORDER BY relevance_score DESC, published_date DESC LIMIT 10"
+    ),
+    "view tech >=70": (
+        "SELECT id, title, summary FROM articles WHERE is_filtered = 0 AND category = 'tech' "
+        "AND relevance_score >= 70 ORDER BY relevance_score DESC, published_date DESC LIMIT 10"
+    ),
+    "cleanup": "SELECT count(*) FROM articles WHERE fetched_date < :cutoff",
+    "stats by source": "SELECT source, count(id) FROM articles GROUP BY source",
+}
+
+INDEXES = [index for index in Article.__table__.indexes if index.name not in ("ix_articles_id", "ix_articles_url")]
+
+
+def populate(database: Database, rows: int, batch_size: int = 50000):
+    """Insert rows synthetic articles spread over the last 90 days"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    categories = ["tech", "investment"]
+    sources = [f"Source {i}" for i in range(40)]
+
+    raw = database.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for start in range(0, rows, batch_size):
+            batch = []
+            for i in range(start, min(start + batch_size, rows)):
+                fetched = now - timedelta(minutes=rng.randrange(90 * 24 * 60))
+                batch.append((
+                    f"Synthetic headline {i}", f"https://example.com/{i}", rng.choice(sources),
+                    rng.choice(categories), "AI/ML", "Summary text " * 8, "[]",
+                    rng.randint(0, 100), fetched - timedelta(hours=rng.randint(0, 48)), fetched,
+                    False, rng.random() < 0.05,
+                ))
+            cursor.executemany(
+                "INSERT INTO articles (title, url, source, category, subtopic, summary, key_points, "
+                "relevance_score, published_date, fetched_date, is_duplicate, is_filtered) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def run_queries(database: Database, label: str, repeat: int):
+    """Print each query's plan and best-of-repeat time"""
+    cutoff = datetime.utcnow() - timedelta(days=30)
+    print(f"\n== {label} ==")
+
+    with database.engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        for name, sql in QUERIES.items():
+            plan = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), {"cutoff": cutoff}).fetchall()
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                connection.execute(text(sql), {"cutoff": cutoff}).fetchall()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            print(f"{name:<16} {best * 1000:>10.1f} ms")
+            for row in plan:
+                print(f"{'':<18}{row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000000, help="Articles in the table")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per query (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database = Database(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        database.create_tables()
+        for index in INDEXES:
+            index.drop(database.engine)
+
+        start = time.perf_counter()
+        populate(database, args.rows)
+        print(f"Inserted {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        run_queries(database, "without indexes", args.repeat)
+
+        start = time.perf_counter()
+        for index in INDEXES:
+            index.create(database.engine)
+        print(f"\nBuilt {len(INDEXES)} indexes in {time.perf_counter() - start:.1f}s")
+
+        run_queries(database, "with indexes", args.repeat)
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
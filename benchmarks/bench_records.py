@@ -0,0 +1,95 @@
+"""
+Compare the memory held by pipeline articles as dicts and as ArticleRecords
+
+Usage:
+    python -m benchmarks.bench_records --articles 100000
+
+Both shapes hold a summarized article as the pipeline leaves it (feed
+fields, filter verdict, summary, subtopic, score, key points). The field
+strings are created beforehand and shared, so the numbers are the per-article
+container overhead: the dict itself versus the slotted record, and key_points
+as a JSON string (what the dict pipeline stored) versus a list.
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from benchmarks.synthetic import make_articles
+from src.models import ArticleRecord
+
+
+def as_dict(article: ArticleRecord, key_points) -> dict:
+    """The dict the pipeline used to pass around for a summarized article"""
+    return {
+        "title": article.title,
+        "url": article.url,
+        "source": article.source,
+        "category": article.category,
+        "description": article.description,
+        "content": article.content,
+        "published_date": article.published_date,
+        "author": article.author,
+        "is_filtered": False,
+        "is_duplicate": False,
+        "prompt_tokens_saved": 0,
+        "summary": article.summary,
+        "key_points": json.dumps(key_points),
+        "subtopic": article.subtopic,
+        "relevance_score": article.relevance_score,
+    }
+
+
+def as_record(article: ArticleRecord, key_points) -> ArticleRecord:
+    return ArticleRecord(
+        title=article.title,
+        url=article.url,
+        source=article.source,
+        category=article.category,
+        description=article.description,
+        content=article.content,
+        published_date=article.published_date,
+        author=article.author,
+        summary=article.summary,
+        key_points=list(key_points),
+        subtopic=article.subtopic,
+        relevance_score=article.relevance_score,
+    )
+
+
+def measure(build, articles, points):
+    """Bytes allocated (and still held) while building every article"""
+    gc.collect()
+    tracemalloc.start()
+    built = [build(article, key_points) for article, key_points in zip(articles, points)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100000, help="Articles to hold in memory")
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles, content_words=60)
+    points = []
+    for i, article in enumerate(articles):
+        article.summary = article.description[:150]
+        article.subtopic = "AI/ML"
+        article.relevance_score = i % 101
+        points.append([article.title[:60], article.description[:80], article.content[-80:]])
+
+    results = [("dict", measure(as_dict, articles, points)), ("record", measure(as_record, articles, points))]
+
+    mb = 1024 * 1024
+    print(f"{'shape':>7} {'total MB':>9} {'bytes/article':>14}")
+    for label, size in results:
+        print(f"{label:>7} {size / mb:>9.1f} {size / args.articles:>14.0f}")
+    print(f"records use {1 - results[1][1] / results[0][1]:.0%} less")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark save_articles against the old per-article SELECT-then-INSERT loop
+
+Usage:
+    python -m benchmarks.bench_save --rows 10000 --stored-rate 0.3
+
+Each run uses a fresh SQLite file pre-seeded with --stored-rate of the
+articles, so both paths see the same mix of new and already-stored URLs.
+The stored copies hold an earlier version of each body, as when a story is
+fetched again after an edit. The inserted/skipped counts of the two paths
+are compared, and bodies left in article_bodies without an article are
+counted.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+from benchmarks.synthetic import make_articles
+from src.models import Article, ArticleBody, ArticleRecord, Database, save_articles
+
+
+def legacy_save_articles(database: Database, articles: List[ArticleRecord]) -> Tuple[int, int]:
+    """The original loop: one SELECT per article, then ORM adds"""
+    session = database.get_session()
+    saved = 0
+    skipped = 0
+
+    for article in articles:
+        existing = session.query(Article).filter_by(url=article.url).first()
+        if existing:
+            skipped += 1
+            continue
+
+        # Bodies now live in article_bodies; merge looks each one up like the URL above
+        body = session.merge(ArticleBody(**ArticleBody.make_row(article.description, article.content)))
+        session.add(Article(body=body, **article.column_values()))
+        saved += 1
+
+    session.commit()
+    session.close()
+    return saved, skipped
+
+
+def orphan_bodies(database: Database) -> int:
+    """Stored bodies that no article refers to"""
+    with database.engine.connect() as connection:
+        return connection.exec_driver_sql(
+            "SELECT COUNT(*) FROM article_bodies "
+            "WHERE hash NOT IN (SELECT body_hash FROM articles WHERE body_hash IS NOT NULL)"
+        ).scalar()
+
+
+def fresh_database(path: str, seed_articles: List[ArticleRecord]) -> Database:
+    """Create an empty database file holding only the seed articles"""
+    if os.path.exists(path):
+        os.remove(path)
+    database = Database(f"sqlite:///{path}")
+    database.create_tables()
+    save_articles(database, seed_articles)
+    return database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Articles to save")
+    parser.add_argument("--stored-rate", type=float, default=0.3, help="Share of articles already in the database")
+    args = parser.parse_args()
+
+    logging.getLogger("src.models.persistence").setLevel(logging.WARNING)
+
+    articles = make_articles(args.rows)
+    seed = [
+        ArticleRecord(title=a.title, url=a.url, source=a.source, category=a.category,
+                      description=a.description, content=a.content + " (earlier version)")
+        for a in articles[:int(len(articles) * args.stored_rate)]
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.db")
+
+        database = fresh_database(path, seed)
+        start = time.perf_counter()
+        legacy_counts = legacy_save_articles(database, articles)
+        legacy_time = time.perf_counter() - start
+        legacy_orphans = orphan_bodies(database)
+        database.engine.dispose()
+
+        database = fresh_database(path, seed)
+        start = time.perf_counter()
+        saved, skipped = save_articles(database, articles)
+        bulk_time = time.perf_counter() - start
+        bulk_orphans = orphan_bodies(database)
+        database.engine.dispose()
+
+    match = "yes" if legacy_counts == (saved, skipped) else "NO"
+    print(f"{'path':>8} {'time (s)':>9} {'rows/s':>9} {'inserted':>9} {'skipped':>8} {'orphans':>8}")
+    print(f"{'legacy':>8} {legacy_time:>9.2f} {args.rows / legacy_time:>9.0f} {legacy_counts[0]:>9} {legacy_counts[1]:>8} {legacy_orphans:>8}")
+    print(f"{'bulk':>8} {bulk_time:>9.2f} {args.rows / bulk_time:>9.0f} {saved:>9} {skipped:>8} {bulk_orphans:>8}")
+    print(f"speedup {legacy_time / bulk_time:.1f}x, counts match: {match}")
+
+
+if __name__ == "__main__":
+    main()
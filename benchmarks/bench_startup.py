@@ -0,0 +1,92 @@
+"""
+Benchmark CLI startup: wall time of short main.py commands
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 5 --importtime
+
+Runs each command in a fresh interpreter and reports the best and median
+wall time. The read-only commands run against a throwaway SQLite file with
+the current schema and no articles (passed as DATABASE_URL), never the real
+data/news_aggregator.db. With --importtime each command is also run under
+python -X importtime and its slowest top-level imports are listed.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.models import Database
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = ["--help", "stats", "view --limit 1", "search startup", "fetch --help"]
+
+
+def run(args, extra_flags=()):
+    return subprocess.run(
+        [sys.executable, *extra_flags, "main.py", *args],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+
+
+def wall_times(args, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(args)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def top_imports(args, count: int):
+    """(cumulative microseconds, module) of the slowest top-level imports"""
+    stderr = run(args, ("-X", "importtime")).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(" "):
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def measure(args):
+    # Warm the bytecode cache so the first measured run isn't compiling
+    run(["--help"])
+
+    print(f"{'command':<16} {'best (ms)':>10} {'median (ms)':>12}")
+    for command in COMMANDS:
+        times = wall_times(command.split(), args.repeat)
+        print(f"{command:<16} {min(times) * 1000:>10.0f} {statistics.median(times) * 1000:>12.0f}")
+
+    if args.importtime:
+        for command in COMMANDS:
+            print(f"\n{command}:")
+            for cumulative, name in top_imports(command.split(), args.top):
+                print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command")
+    parser.add_argument("--importtime", action="store_true", help="List the slowest imports of each command")
+    parser.add_argument("--top", type=int, default=6, help="Imports listed per command with --importtime")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{workdir}/startup.db"
+        Database(database_url).create_tables()
+        # Inherited by every measured command
+        os.environ["DATABASE_URL"] = database_url
+        measure(args)
+
+
+if __name__ == "__main__":
+    main()
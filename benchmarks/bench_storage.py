@@ -0,0 +1,118 @@
+"""
+Compare inline article bodies with the compressed article_bodies side table
+
+Usage:
+    python -m benchmarks.bench_storage --rows 100000 --content-words 400
+
+Saves the same synthetic articles into two SQLite files: one with the old
+schema (description and content as Text columns on articles) and one
+through save_articles. Reports file size, articles table size and the time
+of a full scan of the articles table.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from benchmarks.synthetic import make_articles
+from src.models import Database, save_articles
+
+LEGACY_SCHEMA = """
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY, title VARCHAR(500) NOT NULL, url VARCHAR(1000) NOT NULL UNIQUE,
+    source VARCHAR(100) NOT NULL, category VARCHAR(50) NOT NULL, subtopic VARCHAR(100),
+    description TEXT, content TEXT, summary TEXT, key_points TEXT, relevance_score INTEGER,
+    published_date DATETIME, fetched_date DATETIME, author VARCHAR(200),
+    is_duplicate BOOLEAN, is_filtered BOOLEAN
+)
+"""
+
+# Touches every row, like view/stats before their indexes existed
+SCAN_QUERY = "SELECT count(*) FROM articles WHERE summary LIKE '%no such text%'"
+
+
+def table_bytes(database: Database, table: str) -> int:
+    """Bytes of pages used by a table, from the dbstat virtual table"""
+    with database.engine.connect() as connection:
+        try:
+            return connection.execute(
+                text("SELECT sum(pgsize) FROM dbstat WHERE name = :name"), {"name": table}
+            ).scalar() or 0
+        except Exception:
+            return -1  # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+
+
+def scan_time(database: Database, repeat: int = 3) -> float:
+    """Best-of-repeat time of a full articles scan with a cold-ish page cache"""
+    best = None
+    for _ in range(repeat):
+        database.engine.dispose()
+        with database.engine.connect() as connection:
+            start = time.perf_counter()
+            connection.execute(text(SCAN_QUERY)).scalar()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Articles to store")
+    parser.add_argument("--content-words", type=int, default=400, help="Words per article body")
+    args = parser.parse_args()
+
+    logging.getLogger("src.models.persistence").setLevel(logging.WARNING)
+
+    articles = make_articles(args.rows, content_words=args.content_words)
+    for article in articles:
+        # Feed bodies usually arrive as HTML
+        article.content = "".join(f"<p>{part}</p>" for part in article.content.split(". "))
+        article.summary = article.description[:150]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, "inline.db")
+        legacy = Database(f"sqlite:///{legacy_path}")
+        raw = legacy.engine.raw_connection()
+        raw.execute(LEGACY_SCHEMA)
+        raw.executemany(
+            "INSERT INTO articles (title, url, source, category, description, content, summary, "
+            "relevance_score, is_duplicate, is_filtered) VALUES (?, ?, ?, ?, ?, ?, ?, 50, 0, 0)",
+            [(a.title, a.url, a.source, a.category, a.description, a.content, a.summary)
+             for a in articles],
+        )
+        raw.commit()
+        raw.close()
+
+        split_path = os.path.join(tmp_dir, "split.db")
+        split = Database(f"sqlite:///{split_path}")
+        split.create_tables()
+        save_articles(split, articles)
+
+        # Fold the WAL back into the main file before measuring
+        for database in (legacy, split):
+            with database.engine.connect() as connection:
+                connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+        results = []
+        for label, database, path in (("inline", legacy, legacy_path), ("split", split, split_path)):
+            results.append((
+                label,
+                os.path.getsize(path),
+                table_bytes(database, "articles"),
+                table_bytes(database, "article_bodies") if label == "split" else 0,
+                scan_time(database),
+            ))
+            database.engine.dispose()
+
+    mb = 1024 * 1024
+    print(f"{'schema':>7} {'file MB':>8} {'articles MB':>12} {'bodies MB':>10} {'scan ms':>8}")
+    for label, file_size, articles_size, bodies_size, scan in results:
+        print(f"{label:>7} {file_size / mb:>8.1f} {articles_size / mb:>12.1f} {bodies_size / mb:>10.1f} {scan * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
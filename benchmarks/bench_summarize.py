@@ -0,0 +1,101 @@
+"""
+Summarizer concurrency against the Anthropic stub
+
+Usage:
+    python -m benchmarks.bench_summarize --articles 48 --api-latency 0.1 --concurrency 1,4,8
+
+For each max_concurrency, AISummarizer.summarize_batch summarizes the
+articles against the stub in benchmarks/stubs.py, which delays every response
+by --api-latency. Reported are articles per second and the most requests the
+stub was serving at once.
+
+A last run has the stub answer one request with an exhausted request budget
+(anthropic-ratelimit-requests-remaining: 0, resetting --pause seconds later),
+and reports how many requests still arrived before the reset.
+
+Doubles as a check of the bounded pool and the shared rate-limit pause: exits
+non-zero if more than max_concurrency requests were ever in flight, if a
+max_concurrency above 1 never overlapped requests, or if any worker sent a
+request during the pause.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from benchmarks.stubs import StubServer
+from benchmarks.synthetic import make_articles
+from src.summarizer import AISummarizer
+
+# Requests already on their way when the pausing response arrives are allowed
+# to land within this many seconds of it
+PAUSE_GRACE = 0.05
+
+
+def summarize(stubs: StubServer, articles, concurrency: int) -> float:
+    """Summarize every article through the stub; returns the elapsed seconds"""
+    summarizer = AISummarizer(api_key="bench", base_url=stubs.base_url, max_retries=0, max_concurrency=concurrency)
+    start = time.perf_counter()
+    summarized = summarizer.summarize_batch(articles, max_articles=len(articles))
+    elapsed = time.perf_counter() - start
+
+    if len(summarized) != len(articles):
+        raise RuntimeError(f"summarized {len(summarized)} of {len(articles)} articles")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=48, help="Articles summarized per run")
+    parser.add_argument("--api-latency", type=float, default=0.1, help="Seconds the stub takes per request")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated max_concurrency values")
+    parser.add_argument("--pause", type=float, default=1.0, help="Seconds the rate-limited run is paused for")
+    args = parser.parse_args()
+
+    logging.getLogger("src").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    articles = make_articles(args.articles)
+    failures = []
+
+    print(f"{'concurrency':>11} {'time (s)':>9} {'articles/s':>11} {'peak in flight':>15}")
+    for concurrency in [int(n) for n in args.concurrency.split(",")]:
+        with StubServer(articles, latency=args.api_latency) as stubs:
+            elapsed = summarize(stubs, articles, concurrency)
+            peak = stubs.stats()["peak_in_flight"]
+
+        print(f"{concurrency:>11} {elapsed:>9.2f} {len(articles) / elapsed:>11.1f} {peak:>15}")
+        if peak > concurrency:
+            failures.append(f"max_concurrency={concurrency}: {peak} requests in flight")
+        if concurrency > 1 and peak < 2:
+            failures.append(f"max_concurrency={concurrency}: requests never overlapped")
+
+    # Rate limit a request early on, while every worker is busy
+    concurrency = max(int(n) for n in args.concurrency.split(","))
+    rate_limit_at = concurrency + 1
+    with StubServer(articles, latency=args.api_latency, rate_limit_at=rate_limit_at, rate_limit_pause=args.pause) as stubs:
+        elapsed = summarize(stubs, articles, concurrency)
+        stats = stubs.stats()
+
+    if stats["rate_limited_at"] is None:
+        failures.append(f"the stub never reached request {rate_limit_at}; use more --articles")
+    else:
+        paused_from = stats["rate_limited_at"] + PAUSE_GRACE
+        during_pause = [t for t in stats["arrivals"] if paused_from < t < stats["reset_at"]]
+        after_pause = [t for t in stats["arrivals"] if t >= stats["reset_at"]]
+        print(
+            f"\nrate limited at request {rate_limit_at} for {args.pause:.1f}s (max_concurrency={concurrency}): "
+            f"{len(during_pause)} requests during the pause, {len(after_pause)} after, {elapsed:.2f}s total"
+        )
+        if during_pause:
+            failures.append(f"{len(during_pause)} requests were sent during the rate-limit pause")
+        if not after_pause:
+            failures.append("no requests were sent after the rate-limit reset")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Offline stand-ins for the services the pipeline talks to
+
+A single HTTP server (run in a child process, so it doesn't compete with the
+code under test for the GIL or show up in its memory) answers:
+
+- GET  /feeds/<n>.xml - RSS/Atom feeds rendered from the recorded fixtures in
+  benchmarks/fixtures, with one item per synthetic article
+- POST /v1/messages - the Anthropic Messages API, returning a well-formed
+  summary (or a JSON array for packed prompts) and token usage
+- POST /2010-04-01/Accounts/<sid>/Messages.json - Twilio's message create call
+
+Point RSSFetcher at feed_sources(), AISummarizer at base_url, and a
+WhatsAppNotifier's client at it with use_twilio_stub().
+
+The server also counts the Messages API calls it is serving at once, and can
+answer one of them with an exhausted request budget; StubServer.stats()
+reports both (GET /stats).
+"""
+
+import html
+import json
+import multiprocessing
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.request import urlopen
+
+from src.models.record import ArticleRecord
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Each synthetic source is served in the shape of one recorded feed, in turn
+FIXTURES = ["rss_content_encoded.xml", "rss_description.xml", "atom.xml"]
+
+# Item elements and the children whose text is replaced per article
+_ITEM_TAGS = {"rss": "item", "feed": "entry"}
+_FIELDS = {
+    "item": {"title": "title", "link": "link", "guid": "link", "description": "description",
+             "content:encoded": "content"},
+    "entry": {"title": "title", "id": "link", "summary": "description", "content": "content"},
+}
+
+_ARTICLE_MARKER = re.compile(r"^\[Article (\d+)\]$", re.MULTILINE)
+_TITLE_LINE = re.compile(r"^Title: (.*)$", re.MULTILINE)
+
+
+def _cdata(text: str) -> str:
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def _replace_text(item: str, tag: str, text: str) -> str:
+    """Replace the text of <tag ...>...</tag> in an item (the first occurrence)"""
+    pattern = re.compile(rf"(<{re.escape(tag)}(?:\s[^>]*)?>).*?(</{re.escape(tag)}>)", re.DOTALL)
+    return pattern.sub(lambda m: m.group(1) + text + m.group(2), item, count=1)
+
+
+def render_feed(fixture: str, articles: List[ArticleRecord]) -> bytes:
+    """
+    Render a recorded feed with one item per article
+
+    The fixture's channel/feed header is kept as recorded, and its first item
+    is the template for every article: title, link, id, description and content
+    are replaced, the rest (dates, authors, categories, media) is repeated.
+    """
+    text = (FIXTURES_DIR / fixture).read_text()
+    root_tag = "feed" if "<feed" in text else "rss"
+    tag = _ITEM_TAGS[root_tag]
+
+    first = text.index(f"<{tag}>")
+    last = text.rindex(f"</{tag}>") + len(f"</{tag}>")
+    template = text[first:text.index(f"</{tag}>") + len(f"</{tag}>")]
+
+    items = []
+    for article in articles:
+        paragraphs = "".join(f"<p>{html.escape(part)}</p>" for part in _paragraphs(article.content))
+        values = {
+            "title": article.title,
+            "link": article.url,
+            "description": f"<p>{html.escape(article.description)}</p>",
+            "content": paragraphs,
+        }
+        item = template
+        for field, key in _FIELDS[tag].items():
+            item = _replace_text(item, field, _cdata(values[key]))
+        if tag == "entry":
+            item = re.sub(r'(<link rel="alternate"[^>]*href=")[^"]*', lambda m: m.group(1) + article.url, item, count=1)
+        items.append(item)
+
+    return (text[:first] + "\n".join(items) + text[last:]).encode("utf-8")
+
+
+def _paragraphs(content: str, words_per_paragraph: int = 40) -> List[str]:
+    words = content.split()
+    return [" ".join(words[i:i + words_per_paragraph]) for i in range(0, len(words), words_per_paragraph)]
+
+
+def feed_sources(base_url: str, articles: List[ArticleRecord], source_count: int) -> List[Dict]:
+    """RSSFetcher source entries for the stub feeds (articles are dealt round-robin)"""
+    return [
+        {"name": f"Source {i}", "url": f"{base_url}/feeds/{i}.xml", "category": articles[i].category}
+        for i in range(min(source_count, len(articles)))
+    ]
+
+
+def _summary(title: str) -> Dict:
+    return {
+        "summary": f"{title}. The report covers what changed and why it matters. Analysts expect follow-up news.",
+        "key_points": [f"{title[:60]}", "Figures were disclosed", "More details are expected"],
+        "subtopic": "AI/ML",
+        "relevance_score": 40 + len(title) % 60,
+    }
+
+
+def _message_text(prompt: str) -> str:
+    """What the model would answer: one JSON object, or an array for packed prompts"""
+    titles = _TITLE_LINE.findall(prompt)
+    ids = [int(number) for number in _ARTICLE_MARKER.findall(prompt)]
+    if not ids:
+        return json.dumps(_summary(titles[0] if titles else "Untitled"))
+    return json.dumps([dict(_summary(title), id=number) for number, title in zip(ids, titles)])
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real APIs; the SDK and requests reuse connections
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.server.lock:
+                body = json.dumps(self.server.stats).encode()
+            self._reply(200, body, "application/json")
+            return
+
+        match = re.fullmatch(r"/feeds/(\d+)\.xml", self.path)
+        feed = self.server.feeds.get(int(match.group(1))) if match else None
+        if feed is None:
+            self._reply(404, b"not found", "text/plain")
+            return
+        self._reply(200, feed, "application/rss+xml; charset=utf-8")
+
+    def do_POST(self):
+        body = self._read_body()
+
+        if self.path.startswith("/v1/messages"):
+            self._create_message(json.loads(body))
+
+        elif self.path.endswith("/Messages.json"):
+            time.sleep(self.server.latency)
+            account_sid = self.path.split("/")[3]
+            message = {
+                "sid": f"SM{uuid.uuid4().hex}",
+                "account_sid": account_sid,
+                "status": "queued",
+                "num_segments": "1",
+                "direction": "outbound-api",
+                "uri": f"{self.path[:-5]}/SM.json",
+            }
+            self._reply(201, json.dumps(message).encode(), "application/json")
+
+        else:
+            self._reply(404, b"{}", "application/json")
+
+    def _create_message(self, request: Dict):
+        server = self.server
+        stats = server.stats
+        with server.lock:
+            stats["requests"] += 1
+            number = stats["requests"]
+            stats["arrivals"].append(time.time())
+            stats["in_flight"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+
+        try:
+            time.sleep(server.latency)
+            prompt = request["messages"][0]["content"]
+            text = _message_text(prompt)
+            message = {
+                "id": f"msg_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": request["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                # Roughly 4 characters per token, like the preprocessor's estimate
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+            }
+
+            headers = {}
+            if number == server.rate_limit_at:
+                # Request budget used up until the reset, as the real API reports it
+                now = datetime.now(timezone.utc)
+                reset = now + timedelta(seconds=server.rate_limit_pause)
+                headers = {
+                    "anthropic-ratelimit-requests-remaining": "0",
+                    "anthropic-ratelimit-requests-reset": reset.isoformat().replace("+00:00", "Z"),
+                }
+                with server.lock:
+                    stats["rate_limited_at"] = now.timestamp()
+                    stats["reset_at"] = reset.timestamp()
+        finally:
+            with server.lock:
+                stats["in_flight"] -= 1
+
+        self._reply(200, json.dumps(message).encode(), "application/json", headers)
+
+
+def _serve(feeds: Dict[int, bytes], latency: float, rate_limit_at: Optional[int], rate_limit_pause: float, port_pipe):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.feeds = feeds
+    server.latency = latency
+    server.rate_limit_at = rate_limit_at
+    server.rate_limit_pause = rate_limit_pause
+    server.lock = threading.Lock()
+    server.stats = {
+        "requests": 0,
+        "in_flight": 0,
+        "peak_in_flight": 0,
+        "arrivals": [],
+        "rate_limited_at": None,
+        "reset_at": None,
+    }
+    port_pipe.send(server.server_address[1])
+    server.serve_forever()
+
+
+class StubServer:
+    """
+    Feed, Anthropic and Twilio stubs in a child process
+
+    Args:
+        articles: Articles to publish, dealt round-robin across the feeds
+        source_count: Number of feeds
+        latency: Seconds each API (POST) response is delayed by
+        rate_limit_at: Answer this Messages API call (1-based) with no requests
+            remaining until rate_limit_pause seconds later (None = never)
+        rate_limit_pause: Seconds until that exhausted budget resets
+    """
+
+    def __init__(
+        self,
+        articles: List[ArticleRecord],
+        source_count: int = 12,
+        latency: float = 0.0,
+        rate_limit_at: Optional[int] = None,
+        rate_limit_pause: float = 1.0,
+    ):
+        self.articles = articles
+        self.source_count = source_count
+        self.latency = latency
+        self.rate_limit_at = rate_limit_at
+        self.rate_limit_pause = rate_limit_pause
+        self.base_url = None
+        self._process = None
+
+    def __enter__(self) -> "StubServer":
+        feeds = {
+            i: render_feed(FIXTURES[i % len(FIXTURES)], self.articles[i::self.source_count])
+            for i in range(self.source_count)
+        }
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(feeds, self.latency, self.rate_limit_at, self.rate_limit_pause, sender),
+            daemon=True,
+        )
+        self._process.start()
+        self.base_url = f"http://127.0.0.1:{receiver.recv()}"
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join()
+
+    def stats(self) -> Dict:
+        """
+        Messages API calls seen so far: requests, peak_in_flight, arrivals
+        (wall-clock times), and rate_limited_at/reset_at (wall-clock times the
+        exhausted budget was reported and resets, or None)
+        """
+        with urlopen(f"{self.base_url}/stats") as response:
+            return json.loads(response.read())
+
+    def feed_sources(self) -> List[Dict]:
+        return feed_sources(self.base_url, self.articles, self.source_count)
+
+
+def use_twilio_stub(notifier, base_url: str):
+    """Send a WhatsAppNotifier's messages to the stub instead of api.twilio.com"""
+    notifier.client.api.base_url = base_url
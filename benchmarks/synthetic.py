@@ -0,0 +1,87 @@
+"""
+Synthetic article corpora for benchmarks
+Titles are built from a Zipf-weighted pseudo-word vocabulary, and a share of
+them are near-duplicate rewrites (words inserted, dropped or swapped) of
+earlier titles, like the same story syndicated by several outlets.
+"""
+
+import random
+from typing import List
+
+from src.models.record import ArticleRecord
+
+# English letter frequencies, so shingle statistics resemble real headlines
+_LETTERS = "etaoinshrdlcumwfgypbvkjxqz"
+_LETTER_WEIGHTS = [12.7, 9.1, 8.2, 7.5, 7.0, 6.7, 6.3, 6.1, 6.0, 4.3, 4.0, 2.8, 2.8,
+                   2.4, 2.4, 2.2, 2.0, 2.0, 1.9, 1.5, 1.0, 0.8, 0.2, 0.2, 0.1, 0.1]
+
+_vocab_rng = random.Random(7)
+VOCABULARY = [
+    "".join(_vocab_rng.choices(_LETTERS, _LETTER_WEIGHTS, k=_vocab_rng.randint(2, 9)))
+    for _ in range(20000)
+]
+WEIGHTS = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def _words(rng: random.Random, count: int) -> List[str]:
+    return rng.choices(VOCABULARY, WEIGHTS, k=count)
+
+
+def make_title(rng: random.Random) -> str:
+    """Build a random title of 6-13 words"""
+    return " ".join(_words(rng, rng.randint(6, 13))).capitalize()
+
+
+def rewrite_title(rng: random.Random, title: str) -> str:
+    """Apply one or two word-level edits to a title"""
+    words = title.split()
+    for _ in range(rng.randint(1, 2)):
+        op = rng.random()
+        if op < 0.4 and len(words) > 3:
+            del words[rng.randrange(len(words))]
+        elif op < 0.7:
+            words.insert(rng.randrange(len(words) + 1), _words(rng, 1)[0])
+        else:
+            words[rng.randrange(len(words))] = _words(rng, 1)[0]
+    return " ".join(words)
+
+
+def make_titles(count: int, duplicate_rate: float = 0.2, seed: int = 42) -> List[str]:
+    """Build a list of titles where roughly duplicate_rate of them are rewrites"""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        if titles and rng.random() < duplicate_rate:
+            titles.append(rewrite_title(rng, rng.choice(titles)))
+        else:
+            titles.append(make_title(rng))
+    return titles
+
+
+def make_articles(count: int, duplicate_rate: float = 0.2, content_words: int = 120, seed: int = 42) -> List[ArticleRecord]:
+    """Build article records in the shape RSSFetcher produces"""
+    rng = random.Random(seed)
+    articles = []
+    for i, title in enumerate(make_titles(count, duplicate_rate, seed)):
+        body = " ".join(_words(rng, content_words))
+        articles.append(ArticleRecord(
+            title=title,
+            url=f"https://example.com/{seed}/{i}",
+            source=f"Source {i % 12}",
+            category="tech" if i % 2 == 0 else "investment",
+            description=body[:200],
+            content=body,
+        ))
+    return articles
+
+
+def make_corpus(count: int, duplicate_rate: float = 0.2) -> List[ArticleRecord]:
+    """make_articles with clickbait, sponsored and repeated-URL articles mixed in"""
+    articles = make_articles(count, duplicate_rate=duplicate_rate, content_words=60)
+    for i in range(0, count, 97):
+        articles[i].title = "You won't believe " + articles[i].title
+    for i in range(7, count, 89):
+        articles[i].content = "Sponsored. " + articles[i].content
+    for i in range(5, count, 113):
+        articles[i].url = articles[i - 3].url
+    return articles
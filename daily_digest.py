@@ -7,104 +7,89 @@ Run this script via cron for daily automation
 
 import sys
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 
-from src.aggregator import RSSFetcher
-from src.summarizer import AISummarizer
-from src.filters import ContentFilter
-from src.models import db, Article
+from src.aggregator import FeedCache, RSSFetcher, SeenIndex
+from src.summarizer import AISummarizer, BatchJobStore, SummaryCache
+from src.filters import ContentFilter, DuplicateHistory
+from src.metrics import metrics
+from src.models import db, update_summaries
+from src.pipeline import StreamingPipeline
 from src.utils import WhatsAppNotifier
 
 # Load environment variables
 load_dotenv()
 
 
-def fetch_and_save_articles(max_per_source=10, max_summarize=20, category='all'):
+def fetch_and_save_articles(max_per_source=10, max_summarize=20, category='all', batch_token_budget=0,
+                            use_batch_api=False, batch_poll_timeout=900):
     """Fetch, filter, summarize and save articles"""
     print(f"\n[{datetime.now()}] Starting daily news fetch...")
 
     # Initialize database
     db.create_tables()
 
-    # Step 1: Fetch articles
-    print(f"Step 1/4: Fetching articles from RSS feeds...")
-    fetcher = RSSFetcher()
-
-    if category == 'all':
-        articles = fetcher.fetch_all(max_per_source=max_per_source)
-    else:
-        articles = fetcher.fetch_by_category(category, max_per_source=max_per_source)
-
-    print(f"  ✓ Fetched {len(articles)} articles")
-
-    # Step 2: Filter articles
-    print(f"Step 2/4: Filtering content...")
-    content_filter = ContentFilter()
-    filtered_articles = content_filter.filter_articles(articles)
-    print(f"  ✓ Filtered to {len(filtered_articles)} quality articles")
-
-    # Step 3: Summarize articles
-    print(f"Step 3/4: Summarizing top {min(max_summarize, len(filtered_articles))} articles...")
+    feed_cache = FeedCache()
+    fetcher = RSSFetcher(feed_cache=feed_cache, seen_index=SeenIndex.from_database(db))
+    duplicate_history = DuplicateHistory(db)
+    content_filter = ContentFilter(history=duplicate_history)
 
+    summary_cache = None
+    summarizer = None
     try:
-        summarizer = AISummarizer()
-        summarized_articles = summarizer.summarize_batch(filtered_articles, max_articles=max_summarize)
-        # Add remaining articles without summaries
-        if len(filtered_articles) > max_summarize:
-            summarized_articles.extend(filtered_articles[max_summarize:])
-        print(f"  ✓ Summarized {min(max_summarize, len(filtered_articles))} articles")
-    except Exception as e:
-        print(f"  Error during summarization: {e}")
-        summarized_articles = filtered_articles
-
-    # Step 4: Save to database
-    print(f"Step 4/4: Saving to database...")
-    session = db.get_session()
-
-    saved_count = 0
-    duplicate_count = 0
-
-    for article_data in summarized_articles:
-        # Check if article already exists
-        existing = session.query(Article).filter_by(url=article_data['url']).first()
-
-        if existing:
-            duplicate_count += 1
-            continue
-
-        article = Article(
-            title=article_data.get('title'),
-            url=article_data.get('url'),
-            source=article_data.get('source'),
-            category=article_data.get('category'),
-            subtopic=article_data.get('subtopic', ''),
-            description=article_data.get('description', ''),
-            content=article_data.get('content', ''),
-            summary=article_data.get('summary', ''),
-            key_points=article_data.get('key_points', ''),
-            relevance_score=article_data.get('relevance_score', 50),
-            published_date=article_data.get('published_date'),
-            author=article_data.get('author', ''),
-            is_duplicate=article_data.get('is_duplicate', False),
-            is_filtered=article_data.get('is_filtered', False)
+        summary_cache = SummaryCache(db)
+        summarizer = AISummarizer(
+            cache=summary_cache,
+            batch_token_budget=batch_token_budget,
+            batch_jobs=BatchJobStore() if use_batch_api else None,
+            poll_timeout=batch_poll_timeout
         )
+    except Exception as e:
+        print(f"  Error setting up summarization: {e}")
+
+    # Summaries from message batches that were still running when an earlier run gave up
+    late_articles = []
+    if summarizer is not None:
+        late_articles = update_summaries(db, summarizer.collect_late_summaries())
+        if late_articles:
+            print(f"  ✓ Filled in {len(late_articles)} summaries from earlier message batches")
+
+    # Feeds stream through filtering and summarization into the database as they arrive
+    print(f"Fetching, filtering, summarizing and saving articles...")
+    pipeline = StreamingPipeline(
+        db,
+        content_filter,
+        summarizer=summarizer,
+        max_summarize=max_summarize,
+        summarize_chunk_size=max_summarize if use_batch_api else 8,
+        duplicate_history=duplicate_history
+    )
 
-        session.add(article)
-        saved_count += 1
+    if category == 'all':
+        result = pipeline.run(fetcher.iter_all(max_per_source=max_per_source))
+    else:
+        result = pipeline.run(fetcher.iter_by_category(category, max_per_source=max_per_source))
 
-    session.commit()
-    session.close()
+    # Only now are the fetched entries stored, so later runs may send conditional requests
+    feed_cache.save()
 
-    print(f"  ✓ Saved {saved_count} new articles (skipped {duplicate_count} duplicates)")
+    print(f"  ✓ Fetched {result['fetched']} articles")
+    print(f"  ✓ Filtered to {result['filtered']} quality articles")
+    if summary_cache is not None:
+        cache_stats = summary_cache.stats()
+        print(f"  ✓ Summarized {result['summarized']} articles ({cache_stats['hits']} cached)")
+        summary_cache.evict()
+    print(f"  ✓ Saved {result['saved']} new articles (skipped {result['skipped']} duplicates)")
 
-    return summarized_articles[:max_summarize]  # Return summarized articles for WhatsApp
+    return late_articles + result['summarized_articles']  # Return summarized articles for WhatsApp
 
 
 def send_whatsapp_digest(articles, category='all', limit=20, compact=True):
     """Send digest to WhatsApp
 
     Args:
-        articles: List of article dicts
+        articles: List of article records
         category: 'tech', 'investment', or 'all'
         limit: Number of articles to send (default 20)
         compact: Use compact format (default True for efficiency)
@@ -113,12 +98,13 @@ def send_whatsapp_digest(articles, category='all', limit=20, compact=True):
 
     try:
         notifier = WhatsAppNotifier()
-        success = notifier.send_daily_digest(
-            articles,
-            category=category,
-            limit=limit,
-            compact=compact
-        )
+        with metrics.timer("stage_seconds", stage="whatsapp"):
+            success = notifier.send_daily_digest(
+                articles,
+                category=category,
+                limit=limit,
+                compact=compact
+            )
 
         if success:
             print(f"  ✓ WhatsApp digest sent successfully!")
@@ -132,21 +118,38 @@ def send_whatsapp_digest(articles, category='all', limit=20, compact=True):
         return False
 
 
+def prune_run_reports(report_dir, keep):
+    """Delete all but the newest keep run reports (their names sort by start time)"""
+    reports = sorted(Path(report_dir).glob("*.json"))
+    for report in reports[:-keep] if keep > 0 else reports:
+        report.unlink()
+
+
 def main():
     """Main function to run daily digest"""
     # Configuration
     MAX_PER_SOURCE = 10
     MAX_SUMMARIZE = 20
+    USE_BATCH_API = True  # Cron doesn't need low latency; the Message Batches API is cheaper per article
+    BATCH_POLL_TIMEOUT = 15 * 60  # Stop waiting for the batch after this; late summaries are saved next run
+    BATCH_TOKEN_BUDGET = 8000  # Only used when USE_BATCH_API is False: pack articles into shared prompts
     CATEGORY = 'all'  # 'tech', 'investment', or 'all'
     WHATSAPP_LIMIT = 20  # Top 20 articles in WhatsApp (compact format)
     WHATSAPP_COMPACT = True  # Use compact format to fit more articles
+    RUN_REPORT_DIR = Path(__file__).parent / "data" / "run_reports"  # One JSON timing/counter report per run
+    RUN_REPORTS_KEPT = 60  # Older reports are deleted after each run
+    PROMETHEUS_TEXTFILE = None  # e.g. '/var/lib/node_exporter/textfile/news_aggregator.prom'
 
+    metrics.reset()
     try:
         # Fetch and save articles
         articles = fetch_and_save_articles(
             max_per_source=MAX_PER_SOURCE,
             max_summarize=MAX_SUMMARIZE,
-            category=CATEGORY
+            category=CATEGORY,
+            batch_token_budget=BATCH_TOKEN_BUDGET,
+            use_batch_api=USE_BATCH_API,
+            batch_poll_timeout=BATCH_POLL_TIMEOUT
         )
 
         # Send to WhatsApp
@@ -169,6 +172,13 @@ def main():
         traceback.print_exc()
         return 1
 
+    finally:
+        # Written for failed runs too, so slow or failing stages show up
+        metrics.write_report(RUN_REPORT_DIR / f"{metrics.started:%Y%m%d_%H%M%S}.json")
+        prune_run_reports(RUN_REPORT_DIR, RUN_REPORTS_KEPT)
+        if PROMETHEUS_TEXTFILE:
+            metrics.write_prometheus(PROMETHEUS_TEXTFILE)
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -7,17 +7,14 @@ Fetches, filters, and summarizes tech and investment news
 import click
 import os
 import json
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.markdown import Markdown
 
-from src.aggregator import RSSFetcher
-from src.summarizer import AISummarizer
-from src.filters import ContentFilter
-from src.models import db, Article, init_db
+# The src packages (SQLAlchemy, the anthropic SDK, feed parsing) and the
+# rich widgets are imported inside the commands that use them, so read-only
+# commands and --help don't load the fetch/summarize stack
 
 # Load environment variables
 load_dotenv()
@@ -35,92 +32,114 @@ def cli():
 @click.option('--max-per-source', default=10, help='Maximum articles per source')
 @click.option('--max-summarize', default=20, help='Maximum articles to summarize (cost control)')
 @click.option('--category', type=click.Choice(['tech', 'investment', 'all']), default='all', help='Category to fetch')
-def fetch(max_per_source, max_summarize, category):
+@click.option('--max-workers', default=8, help='Maximum feeds fetched concurrently (1 = sequential)')
+@click.option('--no-feed-cache', is_flag=True, help='Ignore ETag/Last-Modified cache and download every feed')
+@click.option('--summarize-concurrency', default=4, help='Maximum summarization requests in flight (1 = sequential)')
+@click.option('--no-summary-cache', is_flag=True, help='Ignore cached summaries and call the API for every article')
+@click.option('--batch-token-budget', default=0, help='Pack several articles per request up to this many input tokens (0 = one per request)')
+@click.option('--batch-api', is_flag=True, help='Summarize through the asynchronous Message Batches API (cheaper, slower; overrides --batch-token-budget)')
+@click.option('--batch-timeout', default=900, help='Seconds to wait for a Message Batch; later summaries are filled in by the next run')
+@click.option('--save-batch-size', default=100, help='Articles saved per database transaction')
+@click.option('--metrics-report', type=click.Path(dir_okay=False), help='Write per-stage timings and counters to this JSON file')
+@click.option('--prometheus-textfile', type=click.Path(dir_okay=False), help='Also write the metrics as a Prometheus textfile (e.g. for node_exporter)')
+def fetch(max_per_source, max_summarize, category, max_workers, no_feed_cache, summarize_concurrency, no_summary_cache,
+          batch_token_budget, batch_api, batch_timeout, save_batch_size, metrics_report, prometheus_textfile):
     """Fetch and process latest news articles"""
-    console.print("\n[bold cyan]News Aggregator - Fetching Articles[/bold cyan]\n")
-
-    # Initialize database
-    db.create_tables()
-
-    # Step 1: Fetch articles
-    console.print("[yellow]Step 1/4:[/yellow] Fetching articles from RSS feeds...")
-    fetcher = RSSFetcher()
-
-    if category == 'all':
-        articles = fetcher.fetch_all(max_per_source=max_per_source)
-    else:
-        articles = fetcher.fetch_by_category(category, max_per_source=max_per_source)
-
-    console.print(f"  ✓ Fetched {len(articles)} articles\n")
+    from src.aggregator import FeedCache, RSSFetcher, SeenIndex
+    from src.filters import ContentFilter, DuplicateHistory
+    from src.metrics import metrics
+    from src.models import db, update_summaries
+    from src.pipeline import StreamingPipeline
+    from src.summarizer import AISummarizer, BatchJobStore, SummaryCache
 
-    # Step 2: Filter articles
-    console.print("[yellow]Step 2/4:[/yellow] Filtering content...")
-    content_filter = ContentFilter()
-    filtered_articles = content_filter.filter_articles(articles)
-    console.print(f"  ✓ Filtered to {len(filtered_articles)} quality articles\n")
+    console.print("\n[bold cyan]News Aggregator - Fetching Articles[/bold cyan]\n")
+    metrics.reset()
 
-    # Step 3: Summarize articles
-    console.print(f"[yellow]Step 3/4:[/yellow] Summarizing top {min(max_summarize, len(filtered_articles))} articles...")
+    try:
+        # Initialize database
+        db.create_tables()
 
-    if max_summarize == 0 or not os.getenv("ANTHROPIC_API_KEY") or os.getenv("ANTHROPIC_API_KEY") == "your_anthropic_api_key_here":
-        if not os.getenv("ANTHROPIC_API_KEY") or os.getenv("ANTHROPIC_API_KEY") == "your_anthropic_api_key_here":
-            console.print("  [yellow]⚠ ANTHROPIC_API_KEY not set. Skipping summarization.[/yellow]")
+        feed_cache = None if no_feed_cache else FeedCache()
+        fetcher = RSSFetcher(
+            max_workers=max_workers,
+            feed_cache=feed_cache,
+            seen_index=SeenIndex.from_database(db)
+        )
+        duplicate_history = DuplicateHistory(db)
+        content_filter = ContentFilter(history=duplicate_history)
+
+        summarizer = None
+        summary_cache = None
+        if max_summarize == 0 or not os.getenv("ANTHROPIC_API_KEY") or os.getenv("ANTHROPIC_API_KEY") == "your_anthropic_api_key_here":
+            if not os.getenv("ANTHROPIC_API_KEY") or os.getenv("ANTHROPIC_API_KEY") == "your_anthropic_api_key_here":
+                console.print("[yellow]⚠ ANTHROPIC_API_KEY not set. Skipping summarization.[/yellow]\n")
+            else:
+                console.print("[yellow]Skipping summarization (max_summarize=0).[/yellow]\n")
         else:
-            console.print("  [yellow]Skipping summarization (max_summarize=0).[/yellow]")
-        summarized_articles = filtered_articles
-    else:
-        try:
-            summarizer = AISummarizer()
-            summarized_articles = summarizer.summarize_batch(filtered_articles, max_articles=max_summarize)
-            # Add remaining articles without summaries
-            if len(filtered_articles) > max_summarize:
-                summarized_articles.extend(filtered_articles[max_summarize:])
-            console.print(f"  ✓ Summarized {min(max_summarize, len(filtered_articles))} articles\n")
-        except Exception as e:
-            console.print(f"  [red]Error during summarization: {e}[/red]")
-            console.print("  [yellow]Continuing without summaries...[/yellow]\n")
-            summarized_articles = filtered_articles
-
-    # Step 4: Save to database
-    console.print("[yellow]Step 4/4:[/yellow] Saving to database...")
-    session = db.get_session()
-
-    saved_count = 0
-    duplicate_count = 0
-
-    for article_data in summarized_articles:
-        # Check if article already exists
-        existing = session.query(Article).filter_by(url=article_data['url']).first()
+            try:
+                summary_cache = None if no_summary_cache else SummaryCache(db)
+                summarizer = AISummarizer(
+                    max_concurrency=summarize_concurrency,
+                    cache=summary_cache,
+                    batch_token_budget=batch_token_budget,
+                    batch_jobs=BatchJobStore() if batch_api else None,
+                    poll_timeout=batch_timeout
+                )
+            except Exception as e:
+                console.print(f"[red]Error setting up summarization: {e}[/red]")
+                console.print("[yellow]Continuing without summaries...[/yellow]\n")
+
+        # Summaries from message batches that were still running when an earlier run gave up
+        if summarizer is not None:
+            late_articles = update_summaries(db, summarizer.collect_late_summaries())
+            if late_articles:
+                console.print(f"  ✓ Filled in {len(late_articles)} summaries from earlier message batches\n")
+
+        def report(saved, skipped):
+            console.print(f"  ✓ Saved {saved} new articles (skipped {skipped} duplicates)")
+
+        # Feeds stream through filtering and summarization into the database as they arrive
+        console.print("[yellow]Fetching, filtering, summarizing and saving articles...[/yellow]")
+        pipeline = StreamingPipeline(
+            db,
+            content_filter,
+            summarizer=summarizer,
+            max_summarize=max_summarize,
+            # The Message Batches API is cheapest with every article in one batch
+            summarize_chunk_size=max_summarize if batch_api else summarize_concurrency * 2,
+            save_batch_size=save_batch_size,
+            duplicate_history=duplicate_history,
+            on_save=report
+        )
 
-        if existing:
-            duplicate_count += 1
-            continue
+        if category == 'all':
+            result = pipeline.run(fetcher.iter_all(max_per_source=max_per_source))
+        else:
+            result = pipeline.run(fetcher.iter_by_category(category, max_per_source=max_per_source))
 
-        article = Article(
-            title=article_data.get('title'),
-            url=article_data.get('url'),
-            source=article_data.get('source'),
-            category=article_data.get('category'),
-            subtopic=article_data.get('subtopic', ''),
-            description=article_data.get('description', ''),
-            content=article_data.get('content', ''),
-            summary=article_data.get('summary', ''),
-            key_points=article_data.get('key_points', ''),
-            relevance_score=article_data.get('relevance_score', 50),
-            published_date=article_data.get('published_date'),
-            author=article_data.get('author', ''),
-            is_duplicate=article_data.get('is_duplicate', False),
-            is_filtered=article_data.get('is_filtered', False)
-        )
+        # Only now are the fetched entries stored, so later runs may send conditional requests
+        if feed_cache is not None:
+            feed_cache.save()
 
-        session.add(article)
-        saved_count += 1
+        console.print(f"\n  ✓ Fetched {result['fetched']} articles")
+        console.print(f"  ✓ Filtered to {result['filtered']} quality articles")
+        console.print(f"  ✓ Summarized {result['summarized']} articles")
+        if summary_cache is not None:
+            cache_stats = summary_cache.stats()
+            console.print(f"    (summary cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses)")
+            summary_cache.evict()
+        console.print(f"  ✓ Saved {result['saved']} new articles (skipped {result['skipped']} duplicates)\n")
 
-    session.commit()
-    session.close()
+        console.print(f"[bold green]✓ Fetch complete![/bold green] Run 'python main.py view' to see articles.\n")
 
-    console.print(f"  ✓ Saved {saved_count} new articles (skipped {duplicate_count} duplicates)\n")
-    console.print(f"[bold green]✓ Fetch complete![/bold green] Run 'python main.py view' to see articles.\n")
+    finally:
+        # Written for failed runs too, so slow or failing stages show up
+        if metrics_report:
+            metrics.write_report(metrics_report)
+            console.print(f"  ✓ Run report written to {metrics_report}")
+        if prometheus_textfile:
+            metrics.write_prometheus(prometheus_textfile)
+            console.print(f"  ✓ Prometheus metrics written to {prometheus_textfile}")
 
 
 @cli.command()
@@ -129,10 +148,17 @@ def fetch(max_per_source, max_summarize, category):
 @click.option('--min-score', default=0, help='Minimum relevance score (0-100)')
 def view(category, limit, min_score):
     """View aggregated news articles"""
+    from rich.panel import Panel
+    from sqlalchemy.orm import load_only
+    from src.models import db, Article
+
     session = db.get_session()
 
-    # Build query
-    query = session.query(Article).filter(Article.is_filtered == False)
+    # Build query, loading only the columns the panels show
+    query = session.query(Article).options(load_only(
+        Article.title, Article.url, Article.source, Article.category, Article.subtopic,
+        Article.relevance_score, Article.published_date, Article.summary, Article.key_points
+    )).filter(Article.is_filtered == False)
 
     if category != 'all':
         query = query.filter(Article.category == category)
@@ -202,18 +228,72 @@ def view(category, limit, min_score):
     session.close()
 
 
+@cli.command()
+@click.argument('query')
+@click.option('--category', type=click.Choice(['tech', 'investment', 'all']), default='all', help='Category filter')
+@click.option('--limit', default=10, help='Number of results to display')
+def search(query, category, limit):
+    """Full-text search over stored articles (append * for prefix matches)"""
+    from rich.markup import escape
+    from rich.panel import Panel
+    from rich.text import Text
+    from src.models import db, search_articles
+
+    start = time.perf_counter()
+    try:
+        results = search_articles(db, query, limit=limit, category=None if category == 'all' else category)
+    except RuntimeError as e:
+        console.print(f"\n[red]{escape(str(e))}[/red]\n")
+        return
+    elapsed = time.perf_counter() - start
+
+    if not results:
+        console.print(f"\n[yellow]No articles match '{query}'.[/yellow]\n")
+        return
+
+    console.print(f"\n[bold cyan]Search results for '{query}'[/bold cyan]")
+    console.print(f"[dim]{len(results)} articles in {elapsed * 1000:.0f} ms[/dim]\n")
+
+    for i, result in enumerate(results, 1):
+        snippet = Text()
+        for segment, is_match in result['snippet']:
+            snippet.append(segment, style="bold yellow" if is_match else None)
+
+        details = Text(f"{result['source']} · {result['category']} · relevance {result['relevance_score']}/100\n",
+                       style="cyan")
+        details.append(snippet)
+        details.append(f"\n{result['url']}", style="dim")
+
+        console.print(Panel(details, title=f"[{i}] {escape(result['title'])}", border_style="blue", padding=(0, 1)))
+
+    console.print()
+
+
 @cli.command()
 @click.option('--days', default=7, help='Number of days to keep')
-def cleanup(days):
+@click.option('--chunk-size', default=500, help='Maximum articles deleted per transaction')
+@click.option('--archive', type=click.Path(dir_okay=False), help='Append deleted articles to this .jsonl.gz file')
+@click.option('--vacuum', 'run_vacuum', is_flag=True, help='Compact the database file afterwards (enables incremental vacuum)')
+def cleanup(days, chunk_size, archive, run_vacuum):
     """Clean up old articles from database"""
     from datetime import timedelta
+    from src.filters import DuplicateHistory
+    from src.models import db, delete_articles_before, vacuum
+    from src.summarizer import SummaryCache
 
-    session = db.get_session()
     cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-    deleted = session.query(Article).filter(Article.fetched_date < cutoff_date).delete()
-    session.commit()
-    session.close()
+    def report(count, seconds):
+        console.print(f"  [dim]deleted {count} articles in {seconds:.2f}s[/dim]")
+
+    db.create_tables()
+    deleted = delete_articles_before(db, cutoff_date, chunk_size=chunk_size, archive_file=archive, on_chunk=report)
+
+    DuplicateHistory(db).purge(cutoff_date)
+    SummaryCache(db).evict()
+
+    if run_vacuum:
+        vacuum(db)
 
     console.print(f"\n[green]✓ Deleted {deleted} articles older than {days} days[/green]\n")
 
@@ -221,30 +301,21 @@ def cleanup(days):
 @cli.command()
 def init():
     """Initialize the database"""
+    from src.models import init_db
+
     console.print("\n[cyan]Initializing database...[/cyan]")
     init_db()
     console.print("[green]✓ Database initialized successfully![/green]\n")
 
 
 @cli.command()
-def stats():
+@click.option('--days', default=7, help='Number of recent days to break down')
+def stats(days):
     """Show database statistics"""
-    session = db.get_session()
-
-    total = session.query(Article).count()
-    tech = session.query(Article).filter(Article.category == 'tech').count()
-    investment = session.query(Article).filter(Article.category == 'investment').count()
-    filtered = session.query(Article).filter(Article.is_filtered == True).count()
-
-    # Get average relevance score
-    from sqlalchemy import func
-    avg_score = session.query(func.avg(Article.relevance_score)).scalar() or 0
+    from rich.table import Table
+    from src.models import db, load_stats
 
-    # Get article count by source
-    from sqlalchemy import func
-    sources = session.query(Article.source, func.count(Article.id)).group_by(Article.source).all()
-
-    session.close()
+    summary = load_stats(db, days=days)
 
     # Display stats
     console.print("\n[bold cyan]Database Statistics[/bold cyan]\n")
@@ -253,24 +324,33 @@ def stats():
     table.add_column("Metric", style="cyan")
     table.add_column("Value", justify="right")
 
-    table.add_row("Total Articles", str(total))
-    table.add_row("Tech Articles", str(tech))
-    table.add_row("Investment Articles", str(investment))
-    table.add_row("Filtered Out", str(filtered))
-    table.add_row("Average Relevance", f"{avg_score:.1f}/100")
+    table.add_row("Total Articles", str(summary['total']))
+    table.add_row("Tech Articles", str(summary['by_category'].get('tech', 0)))
+    table.add_row("Investment Articles", str(summary['by_category'].get('investment', 0)))
+    table.add_row("Filtered Out", str(summary['filtered']))
+    table.add_row("Average Relevance", f"{summary['avg_score']:.1f}/100")
 
     console.print(table)
 
-    if sources:
-        console.print("\n[bold cyan]Articles by Source[/bold cyan]\n")
-        source_table = Table(show_header=True, header_style="bold magenta")
-        source_table.add_column("Source", style="cyan")
-        source_table.add_column("Count", justify="right")
+    breakdowns = [
+        ("Articles by Source", "Source", sorted(summary['by_source'].items(), key=lambda x: x[1], reverse=True)),
+        ("Articles by Day", "Day", [(str(day), count) for day, count in summary['by_day'].items()]),
+        ("Top Subtopics", "Subtopic", list(summary['by_subtopic'].items())),
+    ]
+
+    for title, label, rows in breakdowns:
+        if not rows:
+            continue
+
+        console.print(f"\n[bold cyan]{title}[/bold cyan]\n")
+        breakdown_table = Table(show_header=True, header_style="bold magenta")
+        breakdown_table.add_column(label, style="cyan")
+        breakdown_table.add_column("Count", justify="right")
 
-        for source, count in sorted(sources, key=lambda x: x[1], reverse=True):
-            source_table.add_row(source, str(count))
+        for key, count in rows:
+            breakdown_table.add_row(key, str(count))
 
-        console.print(source_table)
+        console.print(breakdown_table)
 
     console.print()
 
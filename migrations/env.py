@@ -0,0 +1,41 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from src.models import Base, db
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit SQL for the default database without connecting"""
+    context.configure(
+        url=str(db.engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations against the default database"""
+    with db.engine.connect() as connection:
+        # Batch mode lets ALTER-style operations work on SQLite
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,32 @@
+"""Add composite indexes for the view / cleanup / stats queries
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Databases created after these indexes were added to Article already have them
+INDEXES = [
+    ("ix_articles_view_category", ["is_filtered", "category", "relevance_score", "published_date"]),
+    ("ix_articles_view_all", ["is_filtered", "relevance_score", "published_date"]),
+    ("ix_articles_fetched_date", ["fetched_date"]),
+    ("ix_articles_source", ["source"]),
+]
+
+
+def upgrade():
+    for name, columns in INDEXES:
+        op.create_index(name, "articles", columns, if_not_exists=True)
+    # Refresh planner statistics so the new indexes are picked up
+    op.execute("ANALYZE articles")
+
+
+def downgrade():
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="articles", if_exists=True)
@@ -0,0 +1,118 @@
+"""Move article description/content into compressed article_bodies
+
+Also builds the full-text search index over the moved bodies.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from src.models.article_body import ArticleBody
+from src.models.search import ensure_search_index
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _columns(table):
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    connection = op.get_bind()
+
+    if not sa.inspect(connection).has_table("article_bodies"):
+        op.create_table(
+            "article_bodies",
+            sa.Column("hash", sa.String(64), primary_key=True),
+            sa.Column("description_data", sa.LargeBinary, nullable=True),
+            sa.Column("content_data", sa.LargeBinary, nullable=True),
+        )
+
+    if "body_hash" not in _columns("articles"):
+        with op.batch_alter_table("articles") as batch_op:
+            batch_op.add_column(sa.Column("body_hash", sa.String(64), nullable=True))
+            batch_op.create_index("ix_articles_body_hash", ["body_hash"])
+
+    # Databases created after the move have no inline columns left to migrate
+    if "content" in _columns("articles"):
+        _move_bodies(connection)
+
+    # The search command only reads the index, so build it here from the moved bodies
+    session = Session(bind=connection)
+    try:
+        ensure_search_index(session)
+        session.flush()
+    finally:
+        session.close()
+
+
+def _move_bodies(connection):
+    bodies = sa.table(
+        "article_bodies",
+        sa.column("hash", sa.String),
+        sa.column("description_data", sa.LargeBinary),
+        sa.column("content_data", sa.LargeBinary),
+    )
+    stored = {body_hash for (body_hash,) in connection.execute(sa.text("SELECT hash FROM article_bodies"))}
+
+    while True:
+        rows = connection.execute(sa.text(
+            "SELECT id, description, content FROM articles WHERE body_hash IS NULL LIMIT :limit"
+        ), {"limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+
+        new_bodies = []
+        updates = []
+        for article_id, description, content in rows:
+            body = ArticleBody.make_row(description, content)
+            if body["hash"] not in stored:
+                stored.add(body["hash"])
+                new_bodies.append(body)
+            updates.append({"id": article_id, "body_hash": body["hash"]})
+
+        if new_bodies:
+            connection.execute(bodies.insert(), new_bodies)
+        connection.execute(sa.text("UPDATE articles SET body_hash = :body_hash WHERE id = :id"), updates)
+
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("description")
+        batch_op.drop_column("content")
+
+    # Run VACUUM afterwards (outside a transaction) to give the freed pages back to the filesystem
+
+
+def downgrade():
+    connection = op.get_bind()
+
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.add_column(sa.Column("description", sa.Text, nullable=True))
+        batch_op.add_column(sa.Column("content", sa.Text, nullable=True))
+
+    rows = connection.execute(sa.text(
+        "SELECT a.id, b.description_data, b.content_data FROM articles a "
+        "JOIN article_bodies b ON b.hash = a.body_hash"
+    )).fetchall()
+    updates = [
+        {"id": article_id, "description": ArticleBody(description_data=d).description,
+         "content": ArticleBody(content_data=c).content}
+        for article_id, d, c in rows
+    ]
+    if updates:
+        connection.execute(sa.text(
+            "UPDATE articles SET description = :description, content = :content WHERE id = :id"
+        ), updates)
+
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_index("ix_articles_body_hash")
+        batch_op.drop_column("body_hash")
+
+    op.drop_table("article_bodies")
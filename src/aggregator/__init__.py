@@ -1,3 +1,5 @@
+from src.aggregator.feed_cache import FeedCache
 from src.aggregator.rss_fetcher import RSSFetcher
+from src.aggregator.seen_index import SeenIndex
 
-__all__ = ["RSSFetcher"]
+__all__ = ["FeedCache", "RSSFetcher", "SeenIndex"]
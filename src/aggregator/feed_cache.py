@@ -0,0 +1,75 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """Persistent store of ETag / Last-Modified validators per feed URL"""
+
+    def __init__(self, cache_file: str = None):
+        if cache_file is None:
+            cache_file = Path(__file__).parent.parent.parent / "data" / "feed_cache.json"
+
+        self.cache_file = Path(cache_file)
+        self._entries = self._load()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load cached validators from disk"""
+        if not self.cache_file.exists():
+            return {}
+
+        try:
+            with open(self.cache_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading feed cache: {e}")
+            return {}
+
+    def get_headers(self, url: str) -> Dict[str, str]:
+        """Build conditional request headers for a feed URL"""
+        with self._lock:
+            entry = self._entries.get(url, {})
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Remember the validators returned with a successful response"""
+        with self._lock:
+            if not etag and not last_modified:
+                if url in self._entries:
+                    del self._entries[url]
+                    self._dirty = True
+                return
+
+            entry = {"etag": etag, "last_modified": last_modified}
+            if self._entries.get(url) != entry:
+                self._entries[url] = entry
+                self._dirty = True
+
+    def save(self):
+        """Write the cache to disk if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix(".tmp")
+                with open(tmp_file, "w") as f:
+                    json.dump(self._entries, f, indent=2)
+                tmp_file.replace(self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                logger.error(f"Error saving feed cache: {e}")
@@ -1,23 +1,56 @@
 import feedparser
+import requests
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 import logging
+import time
+
+from src.aggregator.feed_cache import FeedCache
+from src.aggregator.seen_index import SeenIndex
+from src.metrics import metrics
+from src.models.record import ArticleRecord
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Mozilla/5.0 (compatible; NewsAggregator/1.0; +https://github.com/shenxuan752/ai-news-aggregator-whatsapp)"
+
 
 class RSSFetcher:
     """Fetches articles from RSS feeds"""
 
-    def __init__(self, sources_file: str = None):
+    def __init__(
+        self,
+        sources_file: str = None,
+        max_workers: int = 8,
+        timeout: float = 15.0,
+        feed_cache: Optional[FeedCache] = None,
+        seen_index: Optional[SeenIndex] = None,
+    ):
+        """
+        Initialize RSS fetcher
+
+        Args:
+            sources_file: Path to the YAML sources file
+            max_workers: Maximum number of feeds fetched concurrently (1 = sequential)
+            timeout: Per-source request timeout in seconds
+            feed_cache: Optional ETag / Last-Modified cache for conditional requests.
+                New validators are only held in memory; call feed_cache.save() once
+                the fetched articles have been stored, so a failed run re-downloads them
+            seen_index: Optional index of stored URLs; known entries are skipped before parsing
+        """
         if sources_file is None:
             sources_file = Path(__file__).parent.parent.parent / "config" / "sources.yaml"
 
         self.sources_file = sources_file
         self.sources = self._load_sources()
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.feed_cache = feed_cache
+        self.seen_index = seen_index
 
     def _load_sources(self) -> Dict:
         """Load RSS sources from YAML file"""
@@ -28,30 +61,70 @@ class RSSFetcher:
             logger.error(f"Error loading sources file: {e}")
             return {"technology": [], "investment": []}
 
-    def fetch_feed(self, url: str, source_name: str, category: str) -> List[Dict]:
+    def fetch_feed(self, url: str, source_name: str, category: str) -> List[ArticleRecord]:
         """Fetch and parse a single RSS feed"""
         articles = []
+        start = time.perf_counter()
+        status = "error"
 
         try:
             logger.info(f"Fetching feed from {source_name} ({url})")
-            feed = feedparser.parse(url)
+            headers = {"User-Agent": USER_AGENT}
+            if self.feed_cache is not None:
+                headers.update(self.feed_cache.get_headers(url))
+
+            response = requests.get(url, timeout=self.timeout, headers=headers)
+
+            if response.status_code == 304:
+                logger.info(f"Feed not modified since last fetch: {source_name}")
+                status = "not_modified"
+                return articles
+
+            response.raise_for_status()
+            metrics.increment("fetch_bytes", len(response.content), source=source_name)
+
+            response_headers = {key.lower(): value for key, value in response.headers.items()}
+            feed = feedparser.parse(response.content, response_headers=response_headers)
 
             if feed.bozo:
                 logger.warning(f"Feed parsing issue for {source_name}: {feed.bozo_exception}")
 
+            skipped = 0
             for entry in feed.entries:
+                if self.seen_index is not None and entry.get("link", "") in self.seen_index:
+                    skipped += 1
+                    continue
+
                 article = self._parse_entry(entry, source_name, category)
                 if article:
                     articles.append(article)
 
+            if skipped:
+                logger.info(f"Skipped {skipped} already-stored entries from {source_name}")
+                metrics.increment("fetch_skipped_seen", skipped, source=source_name)
+
+            # Only remember validators once the body has been parsed successfully
+            if self.feed_cache is not None:
+                self.feed_cache.update(
+                    url,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+
             logger.info(f"Fetched {len(articles)} articles from {source_name}")
+            status = "ok"
 
         except Exception as e:
             logger.error(f"Error fetching feed from {source_name}: {e}")
 
+        finally:
+            metrics.observe("fetch_seconds", time.perf_counter() - start, source=source_name)
+            metrics.increment("fetch_feeds", status=status)
+            metrics.increment("fetch_articles", len(articles), source=source_name)
+
         return articles
 
-    def _parse_entry(self, entry, source_name: str, category: str) -> Optional[Dict]:
+    def _parse_entry(self, entry, source_name: str, category: str) -> Optional[ArticleRecord]:
         """Parse a single feed entry into article format"""
         try:
             # Extract published date
@@ -76,16 +149,16 @@ class RSSFetcher:
             # Author
             author = entry.get("author", "")
 
-            article = {
-                "title": entry.get("title", "No Title"),
-                "url": entry.get("link", ""),
-                "source": source_name,
-                "category": category,
-                "description": description,
-                "content": content if content else description,
-                "published_date": published_date,
-                "author": author,
-            }
+            article = ArticleRecord(
+                title=entry.get("title", "No Title"),
+                url=entry.get("link", ""),
+                source=source_name,
+                category=category,
+                description=description,
+                content=content if content else description,
+                published_date=published_date,
+                author=author,
+            )
 
             return article
 
@@ -93,45 +166,81 @@ class RSSFetcher:
             logger.error(f"Error parsing entry: {e}")
             return None
 
-    def fetch_all(self, max_per_source: int = 20) -> List[Dict]:
+    def _fetch_source(self, source: Dict, max_per_source: int) -> List[ArticleRecord]:
+        return self.fetch_feed(
+            url=source["url"],
+            source_name=source["name"],
+            category=source["category"]
+        )[:max_per_source]
+
+    def _fetch_sources(self, sources: List[Dict], max_per_source: int) -> List[ArticleRecord]:
+        """
+        Fetch a list of sources, concurrently when max_workers > 1
+
+        Results are concatenated in the order the sources are listed, regardless
+        of which feed finishes first.
+        """
+        def fetch(source: Dict) -> List[ArticleRecord]:
+            return self._fetch_source(source, max_per_source)
+
+        if self.max_workers == 1 or len(sources) <= 1:
+            results = [fetch(source) for source in sources]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources))) as executor:
+                results = list(executor.map(fetch, sources))
+
+        articles = []
+        for fetched in results:
+            articles.extend(fetched)
+
+        return articles
+
+    def iter_sources(self, sources: List[Dict], max_per_source: int) -> Iterator[List[ArticleRecord]]:
+        """
+        Yield each source's articles, in the order the sources are listed
+
+        Feeds are fetched concurrently when max_workers > 1. A feed that
+        finishes before the ones listed above it is held until they have been
+        yielded, so which copy of a story the duplicate filter keeps does not
+        depend on network timing. Closing the generator early cancels the
+        feeds that have not started yet.
+        """
+        if self.max_workers == 1 or len(sources) <= 1:
+            for source in sources:
+                yield self._fetch_source(source, max_per_source)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources)))
+        futures = [executor.submit(self._fetch_source, source, max_per_source) for source in sources]
+        try:
+            # Completed futures hold their batch until its turn comes
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def iter_all(self, max_per_source: int = 20) -> Iterator[List[ArticleRecord]]:
+        """Stream articles from all configured sources, one batch per feed"""
+        sources = self.sources.get("technology", []) + self.sources.get("investment", [])
+        return self.iter_sources(sources, max_per_source)
+
+    def iter_by_category(self, category: str, max_per_source: int = 20) -> Iterator[List[ArticleRecord]]:
+        """Stream articles from a specific category only, one batch per feed"""
+        category_key = "technology" if category == "tech" else category
+        return self.iter_sources(self.sources.get(category_key, []), max_per_source)
+
+    def fetch_all(self, max_per_source: int = 20) -> List[ArticleRecord]:
         """Fetch articles from all configured sources"""
-        all_articles = []
-
-        # Fetch technology sources
-        for source in self.sources.get("technology", []):
-            articles = self.fetch_feed(
-                url=source["url"],
-                source_name=source["name"],
-                category=source["category"]
-            )
-            all_articles.extend(articles[:max_per_source])
-
-        # Fetch investment sources
-        for source in self.sources.get("investment", []):
-            articles = self.fetch_feed(
-                url=source["url"],
-                source_name=source["name"],
-                category=source["category"]
-            )
-            all_articles.extend(articles[:max_per_source])
+        sources = self.sources.get("technology", []) + self.sources.get("investment", [])
+        all_articles = self._fetch_sources(sources, max_per_source)
 
         logger.info(f"Total articles fetched: {len(all_articles)}")
         return all_articles
 
-    def fetch_by_category(self, category: str, max_per_source: int = 20) -> List[Dict]:
+    def fetch_by_category(self, category: str, max_per_source: int = 20) -> List[ArticleRecord]:
         """Fetch articles from a specific category only"""
-        articles = []
-
         category_key = "technology" if category == "tech" else category
-        for source in self.sources.get(category_key, []):
-            fetched = self.fetch_feed(
-                url=source["url"],
-                source_name=source["name"],
-                category=source["category"]
-            )
-            articles.extend(fetched[:max_per_source])
-
-        return articles
+        return self._fetch_sources(self.sources.get(category_key, []), max_per_source)
 
 
 if __name__ == "__main__":
@@ -142,7 +251,7 @@ if __name__ == "__main__":
     print(f"\nFetched {len(articles)} articles")
     if articles:
         print("\nSample article:")
-        print(f"Title: {articles[0]['title']}")
-        print(f"Source: {articles[0]['source']}")
-        print(f"Category: {articles[0]['category']}")
-        print(f"URL: {articles[0]['url']}")
+        print(f"Title: {articles[0].title}")
+        print(f"Source: {articles[0].source}")
+        print(f"Category: {articles[0].category}")
+        print(f"URL: {articles[0].url}")
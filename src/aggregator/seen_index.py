@@ -0,0 +1,37 @@
+from typing import Iterable, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SeenIndex:
+    """In-memory index of article URLs that are already stored"""
+
+    def __init__(self, urls: Optional[Iterable[str]] = None):
+        self._urls = set(urls or [])
+
+    @classmethod
+    def from_database(cls, database) -> "SeenIndex":
+        """Warm the index from the URLs in the articles table"""
+        from src.models.article import Article
+
+        session = database.get_session()
+        try:
+            urls = [url for (url,) in session.query(Article.url)]
+        finally:
+            session.close()
+
+        logger.info(f"Loaded {len(urls)} known article URLs")
+        return cls(urls)
+
+    def add(self, url: str):
+        """Mark a URL as seen"""
+        if url:
+            self._urls.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
@@ -1,3 +1,5 @@
 from src.filters.content_filter import ContentFilter
+from src.filters.duplicate_history import DuplicateHistory
+from src.filters.near_duplicate import MinHashLSH, NearDuplicateIndex
 
-__all__ = ["ContentFilter"]
+__all__ = ["ContentFilter", "DuplicateHistory", "MinHashLSH", "NearDuplicateIndex"]
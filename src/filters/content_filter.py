@@ -1,121 +1,377 @@
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
+from itertools import chain
+from pathlib import Path
 import logging
 import re
+import yaml
+
+from src.filters.near_duplicate import MinHashLSH, NearDuplicateIndex
+from src.metrics import metrics
+from src.models.record import ArticleRecord
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Common clickbait patterns (regular expressions, matched against the lowercased title)
+DEFAULT_CLICKBAIT_PATTERNS = [
+    r"you won't believe",
+    r"shocking",
+    r"this one trick",
+    r"number \d+ will",
+    r"what happens next",
+    r"doctors hate",
+    r"click here",
+    r"this is why",
+    r"the reason is",
+]
+
+# Low quality indicators (plain keywords, matched case-insensitively)
+DEFAULT_LOW_QUALITY_KEYWORDS = [
+    "sponsored",
+    "advertisement",
+    "paid promotion",
+]
+
+# Below this many articles starting a process pool costs more than it saves
+PARALLEL_MIN_ARTICLES = 2000
+
+# Work units per worker, so uneven chunks still balance out
+CHUNKS_PER_WORKER = 4
+
 
 class ContentFilter:
     """Filter and deduplicate news articles"""
 
-    def __init__(self, similarity_threshold: float = 0.75):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.75,
+        lsh: Optional[MinHashLSH] = None,
+        history=None,
+        filters_file: str = None,
+        workers: int = 1,
+    ):
         """
         Initialize content filter
 
         Args:
             similarity_threshold: Threshold for considering articles as duplicates (0-1)
+            lsh: MinHash/LSH settings used to find candidate duplicate titles
+            history: Optional DuplicateHistory of titles stored by earlier runs
+            filters_file: YAML file with clickbait_patterns / low_quality_keywords
+            workers: Processes used by filter_articles for large batches (1 = serial)
         """
         self.similarity_threshold = similarity_threshold
-
-        # Common clickbait patterns
-        self.clickbait_patterns = [
-            r"you won't believe",
-            r"shocking",
-            r"this one trick",
-            r"number \d+ will",
-            r"what happens next",
-            r"doctors hate",
-            r"click here",
-            r"this is why",
-            r"the reason is",
-        ]
-
-        # Low quality indicators
-        self.low_quality_keywords = [
-            "sponsored",
-            "advertisement",
-            "paid promotion",
-        ]
+        self.lsh = lsh or MinHashLSH()
+        self.history = history
+        self.workers = max(1, workers)
+
+        if filters_file is None:
+            filters_file = Path(__file__).parent.parent.parent / "config" / "filters.yaml"
+
+        self.filters_file = filters_file
+        filters = self._load_filters()
+
+        self.clickbait_patterns = filters.get("clickbait_patterns", DEFAULT_CLICKBAIT_PATTERNS)
+        self.low_quality_keywords = filters.get("low_quality_keywords", DEFAULT_LOW_QUALITY_KEYWORDS)
+
+        # Built once: one alternation regex for the title patterns, and lowercased
+        # keywords for plain substring search (faster than a regex on long bodies)
+        self._clickbait_regex = self._compile(self.clickbait_patterns)
+        self._low_quality_keywords = tuple(keyword.lower() for keyword in self.low_quality_keywords)
+        # Characters a keyword can take from one side of a field boundary
+        self._keyword_overlap = max((len(keyword) for keyword in self._low_quality_keywords), default=1) - 1
+
+    def __getstate__(self):
+        # Worker processes only need the patterns and settings, not the database-backed history
+        state = self.__dict__.copy()
+        state["history"] = None
+        return state
+
+    def _load_filters(self) -> Dict:
+        """Load filter patterns from YAML file, falling back to the defaults"""
+        if not Path(self.filters_file).exists():
+            return {}
+
+        try:
+            with open(self.filters_file, "r") as f:
+                return yaml.safe_load(f) or {}
+        except Exception as e:
+            logger.error(f"Error loading filters file: {e}")
+            return {}
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> Optional[Pattern]:
+        """Combine patterns into one compiled alternation (None if there are none)"""
+        if not patterns:
+            return None
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
 
     def is_clickbait(self, title: str) -> bool:
         """Check if article title is clickbait"""
-        title_lower = title.lower()
-
-        for pattern in self.clickbait_patterns:
-            if re.search(pattern, title_lower):
-                logger.debug(f"Clickbait detected: {title}")
-                return True
+        if self._clickbait_regex and self._clickbait_regex.search(title.lower()):
+            logger.debug(f"Clickbait detected: {title}")
+            return True
 
         return False
 
-    def is_low_quality(self, article: Dict) -> bool:
+    def is_low_quality(self, article: ArticleRecord) -> bool:
         """Check if article is low quality"""
-        title = article.get("title", "").lower()
-        content = article.get("content", "").lower()
-        description = article.get("description", "").lower()
-
-        combined_text = f"{title} {content} {description}"
+        title = article.title
+        content = article.content
+        description = article.description
+
+        # Each field is scanned on its own, without building a joined copy. One
+        # substring scan per keyword beats a single alternation regex here:
+        # CPython's str search skips ahead, while re tries every position.
+        fields = (title.lower(), content.lower(), description.lower())
+        keywords = self._low_quality_keywords
+        if any(keyword in field for field in fields for keyword in keywords):
+            logger.debug(f"Low quality content detected: {title}")
+            return True
 
-        for keyword in self.low_quality_keywords:
-            if keyword in combined_text:
-                logger.debug(f"Low quality content detected: {article.get('title', '')}")
-                return True
+        # The joined text also matched keywords spanning two fields; check those
+        seams = self._field_seams(fields)
+        if any(keyword in seams for keyword in keywords):
+            logger.debug(f"Low quality content detected: {title}")
+            return True
 
         # Check if content is too short
         if len(content) < 100 and len(description) < 100:
-            logger.debug(f"Content too short: {article.get('title', '')}")
+            logger.debug(f"Content too short: {title}")
             return True
 
         return False
 
+    def _field_seams(self, fields) -> str:
+        """
+        The fields joined with spaces, each cut to the ends a keyword could span
+
+        A keyword that runs across a field boundary (a title ending in "paid"
+        before content starting with "promotion") takes at most
+        _keyword_overlap characters from either side, so only those ends are
+        kept; a short field is kept whole, as a keyword can span all of it.
+        """
+        overlap = self._keyword_overlap
+        if overlap == 0:
+            return ""
+
+        edges = []
+        for field in fields:
+            if len(field) <= 2 * overlap:
+                edges.append(field)
+            else:
+                # NUL never occurs in a keyword, so nothing matches across the cut
+                edges.append(f"{field[:overlap]}\0{field[-overlap:]}")
+        return " ".join(edges)
+
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate similarity between two texts (0-1)"""
         return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
 
-    def find_duplicates(self, articles: List[Dict]) -> List[int]:
+    def _is_similar(self, title1: str, title2: str) -> bool:
+        """Check title similarity, using cheap upper bounds before the full ratio"""
+        return self._title_matcher(title2).matches(title1)
+
+    def _title_matcher(self, title: str) -> "TitleMatcher":
+        """A TitleMatcher for comparing earlier titles against this one"""
+        return TitleMatcher(title, self.similarity_threshold, self.lsh)
+
+    def _quality_reason(self, article: ArticleRecord) -> Optional[str]:
+        """Return why an article fails the quality checks, or None if it passes"""
+        if self.is_clickbait(article.title):
+            return "clickbait"
+        if self.is_low_quality(article):
+            return "low_quality"
+        return None
+
+    def _passes_quality(self, article: ArticleRecord) -> bool:
+        """Mark an article as filtered if it is clickbait or low quality"""
+        return self._mark_quality(article, self._quality_reason(article))
+
+    @staticmethod
+    def _mark_quality(article: ArticleRecord, reason: Optional[str]) -> bool:
+        """Record a quality verdict on the article; True if it passed"""
+        if reason is not None:
+            article.is_filtered = True
+            article.filter_reason = reason
+            metrics.increment("filter_rejected", reason=reason)
+            return False
+
+        article.is_filtered = False
+        return True
+
+    def find_duplicates(self, articles: List[ArticleRecord]) -> List[int]:
         """
         Find duplicate articles in the list
 
+        Articles with the same URL are always duplicates. Candidate title pairs
+        come from a MinHash/LSH index instead of comparing every pair, and each
+        candidate is confirmed with the same SequenceMatcher ratio and
+        similarity_threshold as calculate_similarity. As before, an article is
+        only compared against earlier articles that were kept. LSH recall is
+        probabilistic: a similar pair that shares no bucket (most likely close
+        to the threshold) is not compared, so this can keep a few articles the
+        all-pairs scan would have dropped.
+
         Returns:
             List of indices of duplicate articles to remove
         """
+        titles = [article.title for article in articles]
+        urls = [article.url for article in articles]
+        band_keys = [self.lsh.band_keys(title) for title in titles]
+
+        duplicates = self._greedy_duplicates(titles, urls, band_keys)
+
+        logger.info(f"Found {len(duplicates)} duplicate articles out of {len(articles)}")
+        return list(duplicates)
+
+    def _greedy_duplicates(
+        self,
+        titles: List[str],
+        urls: List[str],
+        band_keys: List[List[int]],
+        similar_pairs: Optional[Set[Tuple[int, int]]] = None,
+    ) -> Set[int]:
+        """
+        Positions of articles that repeat an earlier kept article's URL or title
+
+        similar_pairs, if given, holds every (i, j) candidate pair with i < j
+        whose titles are similar, precomputed instead of checked here.
+        """
         duplicates = set()
-        n = len(articles)
+        kept_urls = set()
+        index = NearDuplicateIndex(self.lsh)
+
+        # An article is a duplicate if it repeats any earlier kept article, so
+        # each one is checked against the kept articles indexed so far
+        for j, keys in enumerate(band_keys):
+            if urls[j] in kept_urls:
+                duplicates.add(j)
+                logger.debug(f"Duplicate URL found: {urls[j]}")
+                continue
+
+            candidates = sorted(index.candidates_for_keys(keys))
+            if similar_pairs is None:
+                matcher = self._title_matcher(titles[j])
+                similar = next((i for i in candidates if matcher.matches(titles[i])), None)
+            else:
+                similar = next((i for i in candidates if (i, j) in similar_pairs), None)
 
-        for i in range(n):
-            if i in duplicates:
+            if similar is not None:
+                duplicates.add(j)
+                logger.debug(f"Similar titles found: '{titles[similar]}' vs '{titles[j]}'")
                 continue
 
-            article1 = articles[i]
-            title1 = article1.get("title", "")
-            url1 = article1.get("url", "")
+            index.add_band_keys(j, keys)
+            kept_urls.add(urls[j])
 
-            for j in range(i + 1, n):
-                if j in duplicates:
-                    continue
+        return duplicates
 
-                article2 = articles[j]
-                title2 = article2.get("title", "")
-                url2 = article2.get("url", "")
+    def _screen_parallel(
+        self, executor: ProcessPoolExecutor, articles: List[ArticleRecord]
+    ) -> Tuple[List[ArticleRecord], List[int], List[List[int]]]:
+        """
+        Run the quality checks and title MinHashing across the process pool
 
-                # Check URL similarity (same article)
-                if url1 == url2:
-                    duplicates.add(j)
-                    logger.debug(f"Duplicate URL found: {url1}")
-                    continue
+        Returns:
+            (articles that passed, their positions in articles, band keys of their titles)
+        """
+        fields = [
+            ArticleRecord(title=article.title, content=article.content, description=article.description)
+            for article in articles
+        ]
+        size = max(1, -(-len(fields) // (self.workers * CHUNKS_PER_WORKER)))
+        chunks = [fields[start:start + size] for start in range(0, len(fields), size)]
 
-                # Check title similarity
-                title_similarity = self.calculate_similarity(title1, title2)
-                if title_similarity >= self.similarity_threshold:
-                    duplicates.add(j)
-                    logger.debug(f"Similar titles found: '{title1}' vs '{title2}' (similarity: {title_similarity:.2f})")
+        filtered = []
+        positions = []
+        band_keys = []
+        # map() returns chunks in submission order, so verdicts line up with articles
+        verdicts = chain.from_iterable(executor.map(_screen_chunk, chunks))
+        for position, (article, (reason, keys)) in enumerate(zip(articles, verdicts)):
+            if self._mark_quality(article, reason):
+                filtered.append(article)
+                positions.append(position)
+                band_keys.append(keys)
+
+        return filtered, positions, band_keys
+
+    def _find_duplicates_parallel(
+        self,
+        executor: ProcessPoolExecutor,
+        articles: List[ArticleRecord],
+        positions: List[int],
+        band_keys: List[List[int]],
+        batch_size: int,
+    ) -> Set[int]:
+        """
+        find_duplicates with candidate generation and title comparisons in the process pool
+
+        The LSH bands are split between the workers, and each finds the pairs
+        of articles sharing a bucket in its bands. The pair sets are merged
+        here (a pair sharing buckets in several bands is compared only once)
+        and sorted, then the workers compare the titles of every pair. The
+        serial scan finally runs over those verdicts, so the result is
+        exactly that of find_duplicates.
+
+        Articles are identified by their positions in the batch of batch_size
+        articles the workers were started with, whose titles each worker
+        already holds, so no titles are sent along with the pairs.
+        """
+        titles = [article.title for article in articles]
+        urls = [article.url for article in articles]
 
-        logger.info(f"Found {len(duplicates)} duplicate articles out of {n}")
-        return list(duplicates)
+        # Whole bands per unit, so every bucket is gathered by one worker
+        bands = list(zip(*band_keys))
+        size = max(1, -(-len(bands) // (self.workers * CHUNKS_PER_WORKER)))
+        units = [(positions, bands[start:start + size]) for start in range(0, len(bands), size)]
+        pairs = set()
+        for codes in executor.map(_bucket_pairs, units):
+            pairs.update(codes)
+        pairs = sorted(pairs)
+
+        size = max(1, -(-len(pairs) // (self.workers * CHUNKS_PER_WORKER)))
+        chunks = [array("q", pairs[start:start + size]) for start in range(0, len(pairs), size)]
+        similar_codes = chain.from_iterable(executor.map(_similar_pairs, chunks))
+
+        # Back from positions in the whole batch to positions in articles
+        rank = {position: i for i, position in enumerate(positions)}
+        similar_pairs = {(rank[code % batch_size], rank[code // batch_size]) for code in similar_codes}
+
+        duplicates = self._greedy_duplicates(titles, urls, band_keys, similar_pairs)
 
-    def filter_articles(self, articles: List[Dict]) -> List[Dict]:
+        logger.info(f"Found {len(duplicates)} duplicate articles out of {len(articles)}")
+        return duplicates
+
+    def find_history_duplicates(self, articles: List[ArticleRecord]) -> List[int]:
+        """
+        Find articles that repeat a title stored by an earlier run
+
+        Returns:
+            List of indices of articles already covered by the history
+        """
+        if self.history is None or not articles:
+            return []
+
+        titles = [article.title for article in articles]
+        stored_candidates = self.history.candidates(titles)
+
+        duplicates = []
+        for i, (title, stored_titles) in enumerate(zip(titles, stored_candidates)):
+            for stored_title in stored_titles:
+                if self._is_similar(stored_title, title):
+                    duplicates.append(i)
+                    logger.debug(f"Previously seen story: '{title}' vs '{stored_title}'")
+                    break
+
+        logger.info(f"Found {len(duplicates)} articles already seen in earlier runs")
+        return duplicates
+
+    def filter_articles(self, articles: List[ArticleRecord]) -> List[ArticleRecord]:
         """
         Filter articles by removing duplicates, clickbait, and low-quality content
 
@@ -124,44 +380,123 @@ class ContentFilter:
         """
         logger.info(f"Starting filtering process for {len(articles)} articles")
 
-        # First pass: remove clickbait and low quality
-        filtered = []
-        removed_count = 0
+        executor = None
+        if self.workers > 1 and len(articles) >= PARALLEL_MIN_ARTICLES:
+            titles = [article.title for article in articles]
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self, titles))
 
-        for article in articles:
-            if self.is_clickbait(article.get("title", "")):
-                removed_count += 1
-                article["is_filtered"] = True
-                article["filter_reason"] = "clickbait"
-                continue
+        try:
+            # First pass: remove clickbait and low quality
+            if executor is None:
+                filtered = [article for article in articles if self._passes_quality(article)]
+            else:
+                filtered, positions, band_keys = self._screen_parallel(executor, articles)
 
-            if self.is_low_quality(article):
-                removed_count += 1
-                article["is_filtered"] = True
-                article["filter_reason"] = "low_quality"
-                continue
+            logger.info(f"Removed {len(articles) - len(filtered)} clickbait/low-quality articles")
 
-            article["is_filtered"] = False
-            filtered.append(article)
+            # Second pass: remove duplicates within the batch
+            if executor is None:
+                duplicate_indices = set(self.find_duplicates(filtered))
+            else:
+                duplicate_indices = self._find_duplicates_parallel(executor, filtered, positions, band_keys, len(articles))
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
-        logger.info(f"Removed {removed_count} clickbait/low-quality articles")
+        deduplicated = []
+        for i, article in enumerate(filtered):
+            if i in duplicate_indices:
+                article.is_filtered = True
+                article.is_duplicate = True
+            else:
+                article.is_duplicate = False
+                deduplicated.append(article)
+        metrics.increment("filter_rejected", len(duplicate_indices), reason="duplicate")
 
-        # Second pass: remove duplicates
-        duplicate_indices = self.find_duplicates(filtered)
+        # Third pass: remove stories already stored by earlier runs
+        history_indices = set(self.find_history_duplicates(deduplicated))
 
         final_filtered = []
-        for i, article in enumerate(filtered):
-            if i in duplicate_indices:
-                article["is_filtered"] = True
-                article["is_duplicate"] = True
+        for i, article in enumerate(deduplicated):
+            if i in history_indices:
+                article.is_filtered = True
+                article.is_duplicate = True
+                article.filter_reason = "seen_before"
             else:
-                article["is_duplicate"] = False
                 final_filtered.append(article)
+        metrics.increment("filter_rejected", len(history_indices), reason="seen_before")
+        metrics.increment("filter_articles", len(articles))
+        metrics.increment("filter_kept", len(final_filtered))
 
         logger.info(f"Final filtered count: {len(final_filtered)} articles")
         return final_filtered
 
-    def rank_articles(self, articles: List[Dict]) -> List[Dict]:
+    def filter_stream(self, batches: Iterable[List[ArticleRecord]]) -> Iterator[List[ArticleRecord]]:
+        """
+        Filter batches of articles as they arrive (e.g. one batch per feed)
+
+        Applies the same checks as filter_articles, but the kept titles and
+        URLs stay indexed across batches, so each article is compared against
+        every earlier kept article whichever batch it came in.
+
+        Yields:
+            The articles of each batch that pass every filter (empty batches are skipped)
+        """
+        index = NearDuplicateIndex(self.lsh)
+        kept_titles = []
+        kept_urls = set()
+        total = 0
+        passed = 0
+
+        for articles in batches:
+            total += len(articles)
+            deduplicated = []
+
+            for article in articles:
+                if not self._passes_quality(article):
+                    continue
+
+                title = article.title
+                url = article.url
+                band_keys = self.lsh.band_keys(title)
+
+                matcher = self._title_matcher(title)
+                if url in kept_urls or any(
+                    matcher.matches(kept_titles[j])
+                    for j in sorted(index.candidates_for_keys(band_keys))
+                ):
+                    article.is_filtered = True
+                    article.is_duplicate = True
+                    metrics.increment("filter_rejected", reason="duplicate")
+                    continue
+
+                index.add_band_keys(len(kept_titles), band_keys)
+                kept_titles.append(title)
+                kept_urls.add(url)
+                article.is_duplicate = False
+                deduplicated.append(article)
+
+            history_indices = set(self.find_history_duplicates(deduplicated))
+
+            final_filtered = []
+            for i, article in enumerate(deduplicated):
+                if i in history_indices:
+                    article.is_filtered = True
+                    article.is_duplicate = True
+                    article.filter_reason = "seen_before"
+                else:
+                    final_filtered.append(article)
+            metrics.increment("filter_rejected", len(history_indices), reason="seen_before")
+            metrics.increment("filter_articles", len(articles))
+            metrics.increment("filter_kept", len(final_filtered))
+
+            passed += len(final_filtered)
+            if final_filtered:
+                yield final_filtered
+
+        logger.info(f"Stream filtering kept {passed} of {total} articles")
+
+    def rank_articles(self, articles: List[ArticleRecord]) -> List[ArticleRecord]:
         """
         Rank articles by relevance score
 
@@ -170,7 +505,7 @@ class ContentFilter:
         """
         sorted_articles = sorted(
             articles,
-            key=lambda x: x.get("relevance_score", 50),
+            key=lambda x: x.relevance_score,
             reverse=True
         )
 
@@ -178,29 +513,129 @@ class ContentFilter:
         return sorted_articles
 
 
+class TitleMatcher:
+    """
+    Compare earlier titles against one title, cheapest checks first
+
+    SequenceMatcher indexes its second sequence, so one matcher per new title
+    is reused for every candidate instead of re-indexing it per pair. Before
+    the full ratio, candidates must pass SequenceMatcher's length and
+    character-count upper bounds and share enough 3-character shingles: their
+    shingle Dice coefficient (shared shingles over the mean shingle count,
+    the shingle analogue of ratio()) must reach half the threshold. Titles at
+    the 0.75 threshold score well above 0.375, so this only skips pairs that
+    ratio() would reject, without paying for its longest-match search.
+    """
+
+    # Minimum shingle Dice coefficient, as a fraction of the similarity threshold
+    SHINGLE_SCREEN = 0.5
+
+    def __init__(self, title: str, threshold: float, lsh: MinHashLSH):
+        self.threshold = threshold
+        self.lsh = lsh
+        self.shingles = lsh.shingle_strings(title)
+        self.matcher = SequenceMatcher(None, "", title.lower())
+
+    def matches(self, earlier_title: str) -> bool:
+        """Check whether an earlier title is at least threshold-similar to this one"""
+        matcher = self.matcher
+        matcher.set_seq1(earlier_title.lower())
+        threshold = self.threshold
+
+        if matcher.real_quick_ratio() < threshold:
+            return False
+
+        shingles = self.lsh.shingle_strings(earlier_title)
+        shared = len(self.shingles & shingles)
+        if 2 * shared < self.SHINGLE_SCREEN * threshold * (len(self.shingles) + len(shingles)):
+            return False
+
+        return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+# Set in each worker process by _init_worker: the filter, and the titles of the whole batch
+_worker_filter: Optional[ContentFilter] = None
+_worker_titles: List[str] = []
+
+
+def _init_worker(content_filter: ContentFilter, titles: List[str]):
+    global _worker_filter, _worker_titles
+    _worker_filter = content_filter
+    _worker_titles = titles
+
+
+def _screen_chunk(fields: List[ArticleRecord]) -> List[Tuple[Optional[str], Optional[List[int]]]]:
+    """(quality failure reason, title band keys) per article; band keys only for articles that pass"""
+    results = []
+    for article in fields:
+        reason = _worker_filter._quality_reason(article)
+        results.append((reason, None if reason else _worker_filter.lsh.band_keys(article.title)))
+    return results
+
+
+def _bucket_pairs(unit: Tuple[List[int], List[Tuple[int, ...]]]) -> array:
+    """
+    Every pair of positions sharing a bucket in the given bands
+
+    unit holds the articles' positions in the batch and, per band, their band
+    keys in the same order. Each pair (i, j) with i < j is packed into one
+    integer, j * batch size + i, which pickles compactly and sorts by j.
+    """
+    positions, bands = unit
+    base = len(_worker_titles)
+    codes = set()
+    for keys in bands:
+        buckets: Dict[int, List[int]] = defaultdict(list)
+        for position, key in zip(positions, keys):
+            buckets[key].append(position)
+        for members in buckets.values():
+            # Positions are ascending, so each member pairs with the ones before it
+            for a in range(1, len(members)):
+                pair_base = members[a] * base
+                codes.update(pair_base + i for i in members[:a])
+    return array("q", codes)
+
+
+def _similar_pairs(codes: array) -> array:
+    """The packed (i, j) pairs whose titles pass the similarity check"""
+    titles = _worker_titles
+    similar = array("q")
+    current = None
+    matcher = None
+    for code in codes:
+        j, i = divmod(code, len(titles))
+        # Sorted codes come grouped by j, so each title is indexed once per chunk
+        if j != current:
+            current = j
+            matcher = _worker_filter._title_matcher(titles[j])
+        if matcher.matches(titles[i]):
+            similar.append(code)
+    return similar
+
+
 if __name__ == "__main__":
     # Test the filter
     test_articles = [
-        {
-            "title": "You Won't Believe What Happened to Tech Stocks Today!",
-            "content": "Something amazing happened...",
-            "url": "http://example.com/1"
-        },
-        {
-            "title": "Apple Announces New iPhone 15",
-            "content": "Apple has announced the new iPhone 15 with improved camera and battery life. The device features a new A17 chip and will be available starting September.",
-            "url": "http://example.com/2"
-        },
-        {
-            "title": "Apple Announces New iPhone 15 Model",
-            "content": "In a major announcement, Apple unveiled the iPhone 15 with enhanced features including better camera and longer battery.",
-            "url": "http://example.com/3"
-        },
-        {
-            "title": "Sponsored: Buy This Product Now",
-            "content": "This is a paid advertisement for a product.",
-            "url": "http://example.com/4"
-        },
+        ArticleRecord(
+            title="You Won't Believe What Happened to Tech Stocks Today!",
+            content="Something amazing happened...",
+            url="http://example.com/1"
+        ),
+        ArticleRecord(
+            title="Apple Announces New iPhone 15",
+            content="Apple has announced the new iPhone 15 with improved camera and battery life. The device features a new A17 chip and will be available starting September.",
+            url="http://example.com/2"
+        ),
+        ArticleRecord(
+            title="Apple Announces New iPhone 15 Model",
+            content="In a major announcement, Apple unveiled the iPhone 15 with enhanced features including better camera and longer battery.",
+            url="http://example.com/3"
+        ),
+        ArticleRecord(
+            title="Sponsored: Buy This Product Now",
+            content="This is a paid advertisement for a product.",
+            url="http://example.com/4"
+        ),
     ]
 
     filter = ContentFilter()
@@ -210,4 +645,4 @@ if __name__ == "__main__":
     print(f"Filtered: {len(filtered)} articles")
     print("\nFiltered articles:")
     for article in filtered:
-        print(f"  - {article['title']}")
+        print(f"  - {article.title}")
@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+from src.filters.near_duplicate import MinHashLSH
+from src.models.fingerprint import TitleFingerprint, FingerprintBucket
+from src.models.record import ArticleRecord
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's limit on bound parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+
+class DuplicateHistory:
+    """Persistent LSH index of recently stored article titles"""
+
+    def __init__(self, database, lsh: Optional[MinHashLSH] = None):
+        """
+        Initialize duplicate history
+
+        Args:
+            database: Database holding the fingerprint tables
+            lsh: MinHash/LSH settings; must match the ones used to build the index
+        """
+        self.database = database
+        self.lsh = lsh or MinHashLSH()
+
+    def candidates(self, titles: List[str]) -> List[List[str]]:
+        """
+        Look up stored titles that share an LSH bucket with each title
+
+        Returns:
+            One list of stored titles per input title
+        """
+        band_keys = [self.lsh.band_keys(title) for title in titles]
+        all_keys = sorted({key for keys in band_keys for key in keys})
+
+        ids_by_key: Dict[int, List[int]] = {}
+        stored_titles: Dict[int, str] = {}
+
+        session = self.database.get_session()
+        try:
+            for start in range(0, len(all_keys), QUERY_CHUNK_SIZE):
+                chunk = all_keys[start:start + QUERY_CHUNK_SIZE]
+                rows = (
+                    session.query(FingerprintBucket.band_key, TitleFingerprint.id, TitleFingerprint.title)
+                    .join(TitleFingerprint, TitleFingerprint.id == FingerprintBucket.fingerprint_id)
+                    .filter(FingerprintBucket.band_key.in_(chunk))
+                    .all()
+                )
+                for band_key, fingerprint_id, title in rows:
+                    ids_by_key.setdefault(band_key, []).append(fingerprint_id)
+                    stored_titles[fingerprint_id] = title
+        finally:
+            session.close()
+
+        results = []
+        for keys in band_keys:
+            fingerprint_ids = set()
+            for key in keys:
+                fingerprint_ids.update(ids_by_key.get(key, []))
+            results.append([stored_titles[i] for i in sorted(fingerprint_ids)])
+
+        return results
+
+    def add(self, articles: List[ArticleRecord]):
+        """Record the titles of newly stored articles"""
+        if not articles:
+            return
+
+        session = self.database.get_session()
+        try:
+            fingerprints = []
+            for article in articles:
+                fingerprint = TitleFingerprint(
+                    url=article.url,
+                    title=article.title,
+                )
+                session.add(fingerprint)
+                fingerprints.append(fingerprint)
+
+            # Assign ids before writing the bucket rows
+            session.flush()
+
+            buckets = []
+            for fingerprint in fingerprints:
+                for band_key in set(self.lsh.band_keys(fingerprint.title)):
+                    buckets.append({"band_key": band_key, "fingerprint_id": fingerprint.id})
+
+            session.bulk_insert_mappings(FingerprintBucket, buckets)
+            session.commit()
+            logger.info(f"Recorded {len(fingerprints)} title fingerprints")
+        finally:
+            session.close()
+
+    def purge(self, cutoff_date: datetime, chunk_size: int = QUERY_CHUNK_SIZE) -> int:
+        """Delete fingerprints recorded before the cutoff date, chunk_size per transaction"""
+        deleted = 0
+        while True:
+            session = self.database.get_session()
+            try:
+                ids = [
+                    fingerprint_id for (fingerprint_id,) in
+                    session.query(TitleFingerprint.id)
+                    .filter(TitleFingerprint.fetched_date < cutoff_date)
+                    .order_by(TitleFingerprint.id)
+                    .limit(chunk_size)
+                ]
+                if not ids:
+                    break
+
+                session.query(FingerprintBucket).filter(
+                    FingerprintBucket.fingerprint_id.in_(ids)
+                ).delete(synchronize_session=False)
+                deleted += session.query(TitleFingerprint).filter(
+                    TitleFingerprint.id.in_(ids)
+                ).delete(synchronize_session=False)
+                session.commit()
+            finally:
+                session.close()
+
+        return deleted
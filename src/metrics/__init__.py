@@ -0,0 +1,3 @@
+from src.metrics.collector import Metrics, metrics
+
+__all__ = ["Metrics", "metrics"]
@@ -0,0 +1,170 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Prefix for every metric in the Prometheus textfile
+PROMETHEUS_PREFIX = "news_aggregator_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_invalid_name = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _label_text(key: LabelKey) -> str:
+    """source=TechCrunch,stage=fetch - the report's key for one label set ('' for none)"""
+    return ",".join(f"{name}={value}" for name, value in key)
+
+
+def _prometheus_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe counters and timings for one run of the pipeline
+
+    Counters add up values (bytes, articles, tokens); observations keep the
+    count, sum, min and max of durations or sizes. Both are keyed by a name
+    and optional labels such as source or stage. At the end of a run the
+    totals are written as a JSON report and/or a Prometheus textfile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear everything and start timing a new run"""
+        with self._lock:
+            self._counters: Dict[str, Dict[LabelKey, float]] = {}
+            self._observations: Dict[str, Dict[LabelKey, list]] = {}
+            self.started = datetime.utcnow()
+            self._start = time.perf_counter()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Add value to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation (e.g. a duration in seconds)"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._observations.setdefault(name, {})
+            stats = series.get(key)
+            if stats is None:
+                series[key] = [1, value, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = min(stats[2], value)
+                stats[3] = max(stats[3], value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observe the wall time of the with block, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def report(self) -> Dict:
+        """
+        Snapshot of the run
+
+        Returns:
+            Dict with started, duration_seconds, counters ({name: {labels: value}})
+            and timings ({name: {labels: {count, sum, min, max, mean}}})
+        """
+        with self._lock:
+            counters = {
+                name: {_label_text(key): value for key, value in sorted(series.items())}
+                for name, series in sorted(self._counters.items())
+            }
+            timings = {
+                name: {
+                    _label_text(key): {
+                        "count": count, "sum": round(total, 6), "min": round(low, 6),
+                        "max": round(high, 6), "mean": round(total / count, 6),
+                    }
+                    for key, (count, total, low, high) in sorted(series.items())
+                }
+                for name, series in sorted(self._observations.items())
+            }
+            return {
+                "started": self.started.isoformat(),
+                "duration_seconds": round(time.perf_counter() - self._start, 3),
+                "counters": counters,
+                "timings": timings,
+            }
+
+    def prometheus_text(self) -> str:
+        """The run in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = PROMETHEUS_PREFIX + _invalid_name.sub("_", name) + "_total"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{metric}{_prometheus_labels(key)} {value}")
+
+            for name, series in sorted(self._observations.items()):
+                metric = PROMETHEUS_PREFIX + _invalid_name.sub("_", name)
+                lines.append(f"# TYPE {metric} summary")
+                for key, (count, total, _, _) in sorted(series.items()):
+                    labels = _prometheus_labels(key)
+                    lines.append(f"{metric}_count{labels} {count}")
+                    lines.append(f"{metric}_sum{labels} {total:.6f}")
+                lines.append(f"# TYPE {metric}_max gauge")
+                for key, (_, _, _, high) in sorted(series.items()):
+                    lines.append(f"{metric}_max{_prometheus_labels(key)} {high:.6f}")
+
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}run_duration_seconds gauge")
+            lines.append(f"{PROMETHEUS_PREFIX}run_duration_seconds {time.perf_counter() - self._start:.3f}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}run_timestamp_seconds gauge")
+            lines.append(f"{PROMETHEUS_PREFIX}run_timestamp_seconds {time.time():.0f}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _write(path, text: str):
+        """Write atomically so readers (e.g. node_exporter) never see a partial file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_file, "w") as f:
+            f.write(text)
+        tmp_file.replace(path)
+
+    def write_report(self, path):
+        """Write the JSON run report"""
+        self._write(path, json.dumps(self.report(), indent=2))
+        logger.info(f"Wrote run report to {path}")
+
+    def write_prometheus(self, path):
+        """Write a Prometheus textfile (for node_exporter's textfile collector)"""
+        self._write(path, self.prometheus_text())
+        logger.info(f"Wrote Prometheus metrics to {path}")
+
+
+# Process-wide collector the pipeline components record into
+metrics = Metrics()
@@ -1,4 +1,29 @@
 from src.models.article import Article, Base
+from src.models.article_body import ArticleBody
+from src.models.record import ArticleRecord
+from src.models.fingerprint import TitleFingerprint, FingerprintBucket
+from src.models.summary_cache import SummaryCacheEntry
+from src.models.article_stats import ArticleStat, load_stats
 from src.models.database import Database, db, init_db
+from src.models.persistence import save_articles, update_summaries, delete_articles_before, vacuum
+from src.models.search import search_articles
 
-__all__ = ["Article", "Base", "Database", "db", "init_db"]
+__all__ = [
+    "Article",
+    "Base",
+    "ArticleBody",
+    "ArticleRecord",
+    "TitleFingerprint",
+    "FingerprintBucket",
+    "SummaryCacheEntry",
+    "ArticleStat",
+    "Database",
+    "db",
+    "init_db",
+    "save_articles",
+    "update_summaries",
+    "delete_articles_before",
+    "vacuum",
+    "search_articles",
+    "load_stats",
+]
@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 Base = declarative_base()
 
@@ -17,9 +18,9 @@ class Article(Base):
     category = Column(String(50), nullable=False)  # tech or investment
     subtopic = Column(String(100), nullable=True)
 
-    # Content
-    description = Column(Text, nullable=True)
-    content = Column(Text, nullable=True)
+    # Content lives compressed in article_bodies and is loaded on first access
+    body_hash = Column(String(64), ForeignKey("article_bodies.hash"), nullable=True, index=True)
+    body = relationship("ArticleBody", lazy="select")
 
     # AI-generated fields
     summary = Column(Text, nullable=True)
@@ -35,6 +36,27 @@ class Article(Base):
     is_duplicate = Column(Boolean, default=False)
     is_filtered = Column(Boolean, default=False)  # True if filtered out
 
+    # Match the view / cleanup / stats query shapes; existing databases get
+    # these from the alembic migration in migrations/versions
+    __table_args__ = (
+        # view --category X: filter, then read rows already in display order
+        Index("ix_articles_view_category", "is_filtered", "category", "relevance_score", "published_date"),
+        # view (all categories)
+        Index("ix_articles_view_all", "is_filtered", "relevance_score", "published_date"),
+        # cleanup: range delete on fetched_date
+        Index("ix_articles_fetched_date", "fetched_date"),
+        # stats: group by source without touching the table
+        Index("ix_articles_source", "source"),
+    )
+
+    @property
+    def description(self) -> str:
+        return self.body.description if self.body is not None else ""
+
+    @property
+    def content(self) -> str:
+        return self.body.content if self.body is not None else ""
+
     def __repr__(self):
         return f"<Article(id={self.id}, title='{self.title[:50]}...', source='{self.source}')>"
 
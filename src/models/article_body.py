@@ -0,0 +1,49 @@
+import hashlib
+import zlib
+from typing import Dict, Optional
+from sqlalchemy import Column, String, LargeBinary
+from src.models.article import Base
+
+COMPRESSION_LEVEL = 6
+
+
+def _compress(text: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL) if text else None
+
+
+def _decompress(data: Optional[bytes]) -> str:
+    return zlib.decompress(data).decode("utf-8") if data else ""
+
+
+class ArticleBody(Base):
+    """Compressed description and content of an article, shared by identical bodies"""
+    __tablename__ = "article_bodies"
+
+    hash = Column(String(64), primary_key=True)  # sha256 of description + content
+    description_data = Column(LargeBinary, nullable=True)  # zlib-compressed UTF-8
+    content_data = Column(LargeBinary, nullable=True)  # zlib-compressed UTF-8
+
+    @property
+    def description(self) -> str:
+        return _decompress(self.description_data)
+
+    @property
+    def content(self) -> str:
+        return _decompress(self.content_data)
+
+    @staticmethod
+    def make_hash(description: Optional[str], content: Optional[str]) -> str:
+        """Hash that identifies a body (syndicated copies share one row)"""
+        return hashlib.sha256(f"{description or ''}\x1f{content or ''}".encode("utf-8")).hexdigest()
+
+    @classmethod
+    def make_row(cls, description: Optional[str], content: Optional[str]) -> Dict:
+        """Build article_bodies column values for a description and content"""
+        return {
+            "hash": cls.make_hash(description, content),
+            "description_data": _compress(description),
+            "content_data": _compress(content),
+        }
+
+    def __repr__(self):
+        return f"<ArticleBody(hash='{self.hash[:12]}...')>"
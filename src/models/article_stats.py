@@ -0,0 +1,145 @@
+from datetime import date, datetime
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import Column, Integer, String, Date, func, case, inspect
+from sqlalchemy.orm import Session
+from src.models.article import Base, Article
+
+
+class ArticleStat(Base):
+    """Running article counts per fetch day, category, source and subtopic"""
+    __tablename__ = "article_stats"
+
+    day = Column(Date, primary_key=True)
+    category = Column(String(50), primary_key=True)
+    source = Column(String(100), primary_key=True)
+    subtopic = Column(String(100), primary_key=True, default="")
+
+    article_count = Column(Integer, nullable=False, default=0)
+    filtered_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ArticleStat(day={self.day}, category='{self.category}', source='{self.source}', count={self.article_count})>"
+
+
+StatKey = Tuple[date, str, str, str]
+
+
+def _apply(session: Session, deltas: Dict[StatKey, list], sign: int):
+    """Add (sign=1) or subtract (sign=-1) aggregated counts from the stats rows"""
+    for key, (count, filtered, score_sum) in deltas.items():
+        stat = session.get(ArticleStat, key)
+        if stat is None:
+            if sign < 0:
+                continue
+            stat = ArticleStat(day=key[0], category=key[1], source=key[2], subtopic=key[3],
+                               article_count=0, filtered_count=0, score_sum=0)
+            session.add(stat)
+
+        stat.article_count += sign * count
+        stat.filtered_count += sign * filtered
+        stat.score_sum += sign * score_sum
+
+        if stat.article_count <= 0:
+            session.delete(stat)
+
+    # Later calls in the same session look rows up by key
+    session.flush()
+
+
+def record_articles(session: Session, rows: Iterable[Dict]):
+    """Count newly inserted article rows (Article column dicts) in the stats table"""
+    deltas: Dict[StatKey, list] = {}
+    for row in rows:
+        fetched_date = row.get("fetched_date") or datetime.utcnow()
+        key = (fetched_date.date(), row.get("category") or "", row.get("source") or "", row.get("subtopic") or "")
+        delta = deltas.setdefault(key, [0, 0, 0])
+        delta[0] += 1
+        delta[1] += 1 if row.get("is_filtered") else 0
+        delta[2] += row.get("relevance_score") or 0
+
+    _apply(session, deltas, 1)
+
+
+def _grouped_counts(session: Session, *criteria) -> Dict[StatKey, list]:
+    """Aggregate articles matching the criteria by stats key in one pass"""
+    day = func.date(Article.fetched_date)
+    query = (
+        session.query(
+            day,
+            Article.category,
+            Article.source,
+            func.coalesce(Article.subtopic, ""),
+            func.count(Article.id),
+            func.sum(case((Article.is_filtered == True, 1), else_=0)),
+            func.coalesce(func.sum(Article.relevance_score), 0),
+        )
+        .filter(*criteria)
+        .group_by(day, Article.category, Article.source, func.coalesce(Article.subtopic, ""))
+    )
+
+    deltas = {}
+    for row_day, category, source, subtopic, count, filtered, score_sum in query:
+        if isinstance(row_day, str):
+            row_day = date.fromisoformat(row_day)
+        deltas[(row_day, category or "", source or "", subtopic)] = [count, filtered or 0, score_sum]
+    return deltas
+
+
+def forget_articles(session: Session, *criteria):
+    """Subtract the articles matching the criteria; call before deleting them"""
+    _apply(session, _grouped_counts(session, *criteria), -1)
+
+
+def ensure_stats(session: Session):
+    """Build the stats table from existing articles if it has never been filled"""
+    if session.query(ArticleStat.day).first() is not None:
+        return
+    if session.query(Article.id).first() is None:
+        return
+
+    _apply(session, _grouped_counts(session), 1)
+
+
+def load_stats(database, days: int = 7, top_subtopics: int = 10) -> Dict:
+    """
+    Read database statistics from the stats table
+
+    Read-only: until a write (save_articles, cleanup) has built the stats
+    table for existing articles, the counts are aggregated from the articles
+    table instead. A database without an articles table has no stats.
+
+    Returns a dict with total, filtered, avg_score, and by_category, by_source,
+    by_day (the most recent days) and by_subtopic (the largest) breakdowns.
+    """
+    stats = {"total": 0, "filtered": 0, "score_sum": 0,
+             "by_category": {}, "by_source": {}, "by_day": {}, "by_subtopic": {}}
+
+    session = database.get_session()
+    try:
+        tables = inspect(session.get_bind())
+        if not tables.has_table(Article.__tablename__):
+            rows = {}
+        elif tables.has_table(ArticleStat.__tablename__) and session.query(ArticleStat.day).first() is not None:
+            rows = {
+                (stat.day, stat.category, stat.source, stat.subtopic):
+                    [stat.article_count, stat.filtered_count, stat.score_sum]
+                for stat in session.query(ArticleStat)
+            }
+        else:
+            rows = _grouped_counts(session)
+    finally:
+        session.close()
+
+    for (day, category, source, subtopic), (count, filtered, score_sum) in rows.items():
+        stats["total"] += count
+        stats["filtered"] += filtered
+        stats["score_sum"] += score_sum
+        for breakdown, key in (("by_category", category), ("by_source", source),
+                               ("by_day", day), ("by_subtopic", subtopic or "(none)")):
+            stats[breakdown][key] = stats[breakdown].get(key, 0) + count
+
+    stats["avg_score"] = stats.pop("score_sum") / stats["total"] if stats["total"] else 0
+    stats["by_day"] = dict(sorted(stats["by_day"].items(), reverse=True)[:days])
+    stats["by_subtopic"] = dict(sorted(stats["by_subtopic"].items(), key=lambda x: x[1], reverse=True)[:top_subtopics])
+    return stats
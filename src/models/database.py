@@ -1,26 +1,118 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from src.models.article import Base, Article
+from src.models.search import ensure_search_index
 from pathlib import Path
 
+# Applied to every new SQLite connection. WAL lets readers (view, stats) run
+# alongside the cron writer; NORMAL sync is durable enough in WAL mode.
+SQLITE_PRAGMAS = {
+    # Must come before anything writes to a new file; existing files need a VACUUM to switch
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # ms to wait for a lock before raising "database is locked"
+    "cache_size": -64000,  # negative = KiB, so 64 MB of page cache
+    "mmap_size": 268435456,  # 256 MB memory-mapped I/O
+    "temp_store": "MEMORY",
+}
+
 
 class Database:
     """Database manager for the news aggregator"""
 
-    def __init__(self, database_url: str = None):
-        if database_url is None:
-            # Default to SQLite in data directory
-            data_dir = Path(__file__).parent.parent.parent / "data"
-            data_dir.mkdir(exist_ok=True)
-            database_url = f"sqlite:///{data_dir}/news_aggregator.db"
+    def __init__(self, database_url: str = None, sqlite_pragmas: dict = None):
+        """
+        Initialize the database manager
+
+        Nothing touches disk until the engine is first used.
+
+        Args:
+            database_url: SQLAlchemy URL (defaults to $DATABASE_URL, then
+                data/news_aggregator.db)
+            sqlite_pragmas: PRAGMAs set on each SQLite connection (defaults to SQLITE_PRAGMAS)
+        """
+        self.database_url = database_url
+        self.sqlite_pragmas = SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+        self._engine = None
+        self._session_factory = None
+
+    @property
+    def engine(self) -> Engine:
+        """Create the engine on first use"""
+        if self._engine is None:
+            database_url = self.database_url or os.getenv("DATABASE_URL")
+            if not database_url:
+                # Default to SQLite in data directory
+                data_dir = Path(__file__).parent.parent.parent / "data"
+                data_dir.mkdir(exist_ok=True)
+                database_url = f"sqlite:///{data_dir}/news_aggregator.db"
+
+            engine = create_engine(database_url, echo=False)
+            if engine.dialect.name == "sqlite":
+                self._configure_sqlite(engine)
+            self._engine = engine
+
+        return self._engine
+
+    @property
+    def SessionLocal(self) -> sessionmaker:
+        """Session factory bound to the engine"""
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        return self._session_factory
+
+    def _configure_sqlite(self, engine: Engine):
+        """Set the performance PRAGMAs whenever the pool opens a connection"""
+        pragmas = dict(self.sqlite_pragmas)
+        # In-memory databases have no journal file to switch to WAL
+        if engine.url.database in (None, "", ":memory:"):
+            pragmas.pop("journal_mode", None)
+            pragmas.pop("mmap_size", None)
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+    def check_schema(self):
+        """
+        Fail fast if the articles table is missing columns of the current model
+
+        create_all() only creates missing tables, so columns added since a
+        database was created (e.g. articles.body_hash) come from the alembic
+        migrations in migrations/versions.
+        """
+        with self.engine.connect() as connection:
+            tables = inspect(connection)
+            if not tables.has_table(Article.__tablename__):
+                return
+            columns = {column["name"] for column in tables.get_columns(Article.__tablename__)}
 
-        self.engine = create_engine(database_url, echo=False)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        missing = [column.name for column in Article.__table__.columns if column.name not in columns]
+        if missing:
+            raise RuntimeError(
+                f"The database at {self.engine.url} predates the current schema "
+                f"(articles has no {', '.join(missing)}). Back it up and run "
+                f"`alembic upgrade head`, then try again."
+            )
 
     def create_tables(self):
-        """Create all tables in the database"""
+        """Create all tables in the database (after check_schema), and build the search index"""
+        self.check_schema()
         Base.metadata.create_all(bind=self.engine)
+        session = self.get_session()
+        try:
+            ensure_search_index(session)
+            session.commit()
+        finally:
+            session.close()
 
     def get_session(self) -> Session:
         """Get a new database session"""
@@ -31,7 +123,7 @@ class Database:
         Base.metadata.drop_all(bind=self.engine)
 
 
-# Global database instance
+# Global database instance (the engine is created on first use)
 db = Database()
 
 
@@ -0,0 +1,29 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from src.models.article import Base
+
+
+class TitleFingerprint(Base):
+    """Title of a stored article, kept for cross-run near-duplicate checks"""
+    __tablename__ = "title_fingerprints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(1000), nullable=False, index=True)
+    title = Column(String(500), nullable=False)
+    fetched_date = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<TitleFingerprint(id={self.id}, title='{self.title[:50]}...')>"
+
+
+class FingerprintBucket(Base):
+    """LSH band key of a title fingerprint (one row per band)"""
+    __tablename__ = "fingerprint_buckets"
+
+    band_key = Column(BigInteger, primary_key=True)
+    fingerprint_id = Column(
+        Integer,
+        ForeignKey("title_fingerprints.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
@@ -0,0 +1,373 @@
+import gzip
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import logging
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import selectinload
+
+from src.metrics import metrics
+from src.models.article import Article
+from src.models.article_body import ArticleBody
+from src.models.article_stats import ensure_stats, forget_articles, record_articles
+from src.models.record import ArticleRecord
+from src.models.search import ensure_search_index, index_articles, unindex_articles
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement; SQLAlchemy splits further if a chunk exceeds the bound-parameter limit
+INSERT_CHUNK_SIZE = 500
+
+# Articles deleted per retention transaction (kept under SQLite's bound-parameter limit)
+DELETE_CHUNK_SIZE = 500
+
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _article_row(article: ArticleRecord, fetched_date: datetime, body_hash: str) -> Dict:
+    """Map a pipeline article record to Article column values"""
+    row = article.column_values()
+    row["fetched_date"] = fetched_date
+    row["body_hash"] = body_hash
+    return row
+
+
+def _insert_bodies(session, dialect_insert, body_rows: List[Dict]):
+    """Insert compressed bodies, skipping hashes that are already stored"""
+    if dialect_insert is not None:
+        stmt = dialect_insert(ArticleBody).on_conflict_do_nothing(index_elements=["hash"])
+        session.execute(stmt, body_rows)
+        return
+
+    hashes = {row["hash"] for row in body_rows}
+    existing = {h for (h,) in session.query(ArticleBody.hash).filter(ArticleBody.hash.in_(hashes))}
+    new_rows = {row["hash"]: row for row in body_rows if row["hash"] not in existing}
+    if new_rows:
+        session.execute(insert(ArticleBody), list(new_rows.values()))
+
+
+def save_articles(
+    database,
+    articles: List[ArticleRecord],
+    chunk_size: int = INSERT_CHUNK_SIZE,
+    on_saved: Optional[Callable[[List[ArticleRecord]], None]] = None,
+) -> Tuple[int, int]:
+    """
+    Insert articles in bulk, skipping URLs that are already stored
+
+    Uses INSERT ... ON CONFLICT(url) DO NOTHING where the dialect supports it,
+    otherwise looks up existing URLs per chunk before a plain bulk insert.
+    Bodies are stored compressed in article_bodies (those of skipped articles
+    are removed again unless already referenced), and the article_stats
+    table and search index are updated in the same transaction.
+
+    Args:
+        database: Database to save to
+        articles: Article records to store
+        chunk_size: Articles per INSERT statement
+        on_saved: Called with the article records that were inserted, once
+            they are committed
+
+    Returns:
+        (inserted, skipped) - how many articles were stored, and how many were
+        skipped as duplicates
+    """
+    session = database.get_session()
+    dialect_insert = _UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    fetched_date = datetime.utcnow()
+    saved_articles = []
+    saved_rows = []
+    search_rows = []
+    save_start = time.perf_counter()
+
+    try:
+        ensure_stats(session)
+        ensure_search_index(session)
+
+        for start in range(0, len(articles), chunk_size):
+            chunk = articles[start:start + chunk_size]
+            body_rows = [
+                ArticleBody.make_row(article.description, article.content)
+                for article in chunk
+            ]
+            # Bodies go first so the articles' body_hash references resolve
+            _insert_bodies(session, dialect_insert, body_rows)
+            rows = [
+                _article_row(article, fetched_date, body_row["hash"])
+                for article, body_row in zip(chunk, body_rows)
+            ]
+
+            if dialect_insert is not None:
+                stmt = (
+                    dialect_insert(Article)
+                    .on_conflict_do_nothing(index_elements=["url"])
+                    .returning(Article.id, Article.url)
+                )
+                inserted_ids = {url: article_id for article_id, url in session.execute(stmt, rows)}
+            else:
+                urls = {row["url"] for row in rows}
+                existing = {url for (url,) in session.query(Article.url).filter(Article.url.in_(urls))}
+                new_rows = {}
+                for row in rows:
+                    if row["url"] not in existing:
+                        new_rows.setdefault(row["url"], row)
+                inserted_ids = {}
+                if new_rows:
+                    session.execute(insert(Article), list(new_rows.values()))
+                    inserted_ids = dict(session.query(Article.url, Article.id).filter(Article.url.in_(new_rows)))
+
+            # The first article with each URL is the one that was stored
+            skipped_hashes = set()
+            for article, row in zip(chunk, rows):
+                article_id = inserted_ids.pop(article.url, None)
+                if article_id is None:
+                    skipped_hashes.add(row["body_hash"])
+                    continue
+                saved_articles.append(article)
+                saved_rows.append(row)
+                search_rows.append((
+                    article_id, row["title"], row["summary"], row["key_points"], article.content
+                ))
+
+            # Bodies of skipped articles were inserted up front; drop the ones nothing refers to
+            _delete_orphan_bodies(session, skipped_hashes)
+
+        record_articles(session, saved_rows)
+        index_articles(session, search_rows)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    skipped = len(articles) - len(saved_articles)
+    metrics.observe("save_seconds", time.perf_counter() - save_start)
+    metrics.increment("save_articles", len(saved_articles), result="saved")
+    metrics.increment("save_articles", skipped, result="skipped")
+    logger.info(f"Saved {len(saved_articles)} articles, skipped {skipped} duplicates")
+    if on_saved is not None:
+        on_saved(saved_articles)
+    return len(saved_articles), skipped
+
+
+def update_summaries(database, summaries: Dict[str, Dict], chunk_size: int = INSERT_CHUNK_SIZE) -> List[ArticleRecord]:
+    """
+    Fill in summaries that arrived after their articles were saved
+
+    Only stored articles that still have no summary are updated; their stats
+    rows and search index entries are updated in the same transaction.
+
+    Args:
+        database: Database the articles are stored in
+        summaries: Summary dicts (summary, key_points, subtopic, relevance_score) by URL
+
+    Returns:
+        The updated articles as records
+    """
+    if not summaries:
+        return []
+
+    session = database.get_session()
+    updated = []
+
+    try:
+        ensure_stats(session)
+        ensure_search_index(session)
+
+        urls = list(summaries)
+        for start in range(0, len(urls), chunk_size):
+            articles = (
+                session.query(Article)
+                .options(selectinload(Article.body))
+                .filter(Article.url.in_(urls[start:start + chunk_size]))
+                .filter((Article.summary == None) | (Article.summary == ""))
+                .all()
+            )
+            if not articles:
+                continue
+
+            ids = [article.id for article in articles]
+            unindex_articles(session, ids)
+            forget_articles(session, Article.id.in_(ids))
+
+            for article in articles:
+                result = summaries[article.url]
+                article.summary = result["summary"]
+                article.key_points = json.dumps(result["key_points"]) if result["key_points"] else ""
+                article.subtopic = result["subtopic"]
+                article.relevance_score = result["relevance_score"]
+            session.flush()
+
+            record_articles(session, [
+                {"fetched_date": a.fetched_date, "category": a.category, "source": a.source,
+                 "subtopic": a.subtopic, "is_filtered": a.is_filtered, "relevance_score": a.relevance_score}
+                for a in articles
+            ])
+            index_articles(session, [(a.id, a.title, a.summary, a.key_points, a.content) for a in articles])
+            updated.extend(
+                ArticleRecord(
+                    title=a.title, url=a.url, source=a.source, category=a.category,
+                    description=a.description, content=a.content, published_date=a.published_date,
+                    author=a.author or "", subtopic=a.subtopic or "", summary=a.summary,
+                    key_points=list(summaries[a.url]["key_points"]), relevance_score=a.relevance_score,
+                )
+                for a in articles
+            )
+
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    logger.info(f"Filled in {len(updated)} summaries that arrived after their articles were saved")
+    return updated
+
+
+def delete_articles_before(
+    database,
+    cutoff_date: datetime,
+    chunk_size: int = DELETE_CHUNK_SIZE,
+    archive_file: Optional[str] = None,
+    on_chunk: Optional[Callable[[int, float], None]] = None,
+) -> int:
+    """
+    Delete articles fetched before the cutoff date in short transactions
+
+    Each chunk of up to chunk_size articles is (optionally) archived, removed
+    from article_stats and the search index, deleted along with bodies nothing else refers to, and
+    committed, so the write lock is only held briefly. Freed pages are then
+    returned to the filesystem with an incremental vacuum.
+
+    Args:
+        database: Database to clean up
+        cutoff_date: Articles fetched before this are deleted
+        chunk_size: Maximum articles deleted per transaction
+        archive_file: Append each chunk's articles to this gzip-compressed JSON Lines
+            file once its delete has committed
+        on_chunk: Called with (rows deleted, seconds taken) after each chunk
+
+    Returns:
+        Total number of articles deleted
+    """
+    session = database.get_session()
+    try:
+        ensure_stats(session)
+        ensure_search_index(session)
+        session.commit()
+    finally:
+        session.close()
+
+    total = 0
+    while True:
+        start = time.perf_counter()
+        session = database.get_session()
+        try:
+            ids = [
+                article_id for (article_id,) in
+                session.query(Article.id)
+                .filter(Article.fetched_date < cutoff_date)
+                .order_by(Article.id)
+                .limit(chunk_size)
+            ]
+            if not ids:
+                break
+
+            # Read before the delete, written only once it has committed, so a
+            # chunk that fails and is retried is not archived twice
+            archived = _archive_records(session, ids) if archive_file is not None else []
+
+            body_hashes = {
+                body_hash for (body_hash,) in
+                session.query(Article.body_hash).filter(Article.id.in_(ids), Article.body_hash.isnot(None))
+            }
+            forget_articles(session, Article.id.in_(ids))
+            unindex_articles(session, ids)
+            deleted = session.query(Article).filter(Article.id.in_(ids)).delete(synchronize_session=False)
+            _delete_orphan_bodies(session, body_hashes)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        if archived:
+            _append_archive(archive_file, archived)
+
+        elapsed = time.perf_counter() - start
+        total += deleted
+        logger.info(f"Deleted {deleted} articles in {elapsed:.2f}s")
+        if on_chunk is not None:
+            on_chunk(deleted, elapsed)
+
+    if total:
+        _incremental_vacuum(database)
+    return total
+
+
+def _archive_records(session, ids: List[int]) -> List[Dict]:
+    """Article dicts (with their bodies) for the archive"""
+    articles = session.query(Article).options(selectinload(Article.body)).filter(Article.id.in_(ids))
+
+    records = []
+    for article in articles:
+        record = article.to_dict()
+        record["content"] = article.content
+        records.append(record)
+    return records
+
+
+def _append_archive(archive_file: str, records: List[Dict]):
+    """Append records to a gzip-compressed JSON Lines file"""
+    # Appending writes a new gzip member; gzip readers treat the file as one stream
+    with gzip.open(archive_file, "at", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def _delete_orphan_bodies(session, body_hashes: Set[str]) -> int:
+    """Delete the given bodies unless a stored article still refers to them"""
+    if not body_hashes:
+        return 0
+
+    referenced = session.query(Article.body_hash).filter(Article.body_hash.in_(body_hashes))
+    return session.query(ArticleBody).filter(
+        ArticleBody.hash.in_(body_hashes),
+        ArticleBody.hash.notin_(referenced.scalar_subquery()),
+    ).delete(synchronize_session=False)
+
+
+def _incremental_vacuum(database):
+    """Give free pages back to the filesystem (SQLite with auto_vacuum=INCREMENTAL)"""
+    with database.engine.connect() as connection:
+        if connection.dialect.name != "sqlite":
+            return
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            logger.info("auto_vacuum is not INCREMENTAL; run cleanup with --vacuum once to enable it")
+            return
+
+        freed = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+        connection.commit()
+        # sqlite3's execute() steps the pragma once (one page); executescript runs it to completion
+        connection.connection.driver_connection.executescript("PRAGMA incremental_vacuum;")
+        # In WAL mode the file only shrinks once the freed pages are checkpointed
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        logger.info(f"Released {freed} free pages")
+
+
+def vacuum(database):
+    """Rebuild the SQLite file, compacting it and applying the auto_vacuum setting"""
+    with database.engine.connect() as connection:
+        if connection.dialect.name != "sqlite":
+            return
+        # VACUUM cannot run inside a transaction
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        connection.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.exec_driver_sql("VACUUM")
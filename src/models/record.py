@@ -0,0 +1,90 @@
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class ArticleRecord:
+    """
+    In-memory article passed between the pipeline stages
+
+    The fields mirror the Article model's columns (description and content end
+    up compressed in article_bodies), plus the filter verdict and preprocessing
+    savings that are only needed during a run. __slots__ keeps each record far
+    smaller than the equivalent dict, and key_points stays a list until the
+    record is saved.
+    """
+
+    __slots__ = (
+        "title",
+        "url",
+        "source",
+        "category",
+        "description",
+        "content",
+        "published_date",
+        "author",
+        "subtopic",
+        "summary",
+        "key_points",
+        "relevance_score",
+        "is_duplicate",
+        "is_filtered",
+        "filter_reason",
+        "prompt_tokens_saved",
+    )
+
+    def __init__(
+        self,
+        title: str = "",
+        url: str = "",
+        source: str = "",
+        category: str = "",
+        description: str = "",
+        content: str = "",
+        published_date: Optional[datetime] = None,
+        author: str = "",
+        subtopic: str = "",
+        summary: str = "",
+        key_points: Optional[List[str]] = None,
+        relevance_score: int = 50,
+        is_duplicate: bool = False,
+        is_filtered: bool = False,
+        filter_reason: Optional[str] = None,
+        prompt_tokens_saved: int = 0,
+    ):
+        self.title = title
+        self.url = url
+        self.source = source
+        self.category = category
+        self.description = description
+        self.content = content
+        self.published_date = published_date
+        self.author = author
+        self.subtopic = subtopic
+        self.summary = summary
+        self.key_points = key_points if key_points is not None else []
+        self.relevance_score = relevance_score
+        self.is_duplicate = is_duplicate
+        self.is_filtered = is_filtered
+        self.filter_reason = filter_reason
+        self.prompt_tokens_saved = prompt_tokens_saved
+
+    def __repr__(self):
+        return f"<ArticleRecord(title='{self.title[:50]}...', source='{self.source}')>"
+
+    def column_values(self) -> Dict:
+        """Article column values (except fetched_date and body_hash), with key_points as JSON"""
+        return {
+            "title": self.title,
+            "url": self.url,
+            "source": self.source,
+            "category": self.category,
+            "subtopic": self.subtopic,
+            "summary": self.summary,
+            "key_points": json.dumps(self.key_points) if self.key_points else "",
+            "relevance_score": self.relevance_score,
+            "published_date": self.published_date,
+            "author": self.author,
+            "is_duplicate": self.is_duplicate,
+            "is_filtered": self.is_filtered,
+        }
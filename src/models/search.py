@@ -0,0 +1,247 @@
+import html
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session, selectinload
+
+from src.models.article import Article
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Contentless: the index holds no copy of the (already compressed) text, so
+# snippets are cut in Python from the few articles a search returns
+CREATE_SEARCH_INDEX = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, summary, key_points, content, "
+    "content='', tokenize='porter unicode61 remove_diacritics 2')"
+)
+
+# bm25 weights for title, summary, key_points, content
+RANK = "bm25(articles_fts, 10.0, 5.0, 3.0, 1.0)"
+
+INDEX_CHUNK_SIZE = 500
+
+SnippetSegments = List[Tuple[str, bool]]
+
+_tags = re.compile(r"<[^>]+>")
+
+
+def create_search_index(connection):
+    """Create the FTS5 table (SQLite only)"""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(CREATE_SEARCH_INDEX))
+
+
+def _has_search_index(session: Session) -> bool:
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def _key_points_text(key_points: Optional[str]) -> str:
+    """Flatten the stored key_points JSON to plain text"""
+    if not key_points:
+        return ""
+    try:
+        return "\n".join(str(point) for point in json.loads(key_points))
+    except (ValueError, TypeError):
+        return key_points
+
+
+def _plain_text(content: Optional[str]) -> str:
+    """Drop markup from stored feed content"""
+    return html.unescape(_tags.sub(" ", content)) if content else ""
+
+
+def _fts_values(article_id: int, title, summary, key_points, content) -> Dict:
+    return {
+        "id": article_id,
+        "title": title or "",
+        "summary": summary or "",
+        "key_points": _key_points_text(key_points),
+        "content": _plain_text(content),
+    }
+
+
+def index_articles(session: Session, rows: Iterable[Tuple[int, str, str, str, str]]):
+    """Add (id, title, summary, key_points, content) rows to the search index"""
+    if not _has_search_index(session):
+        return
+
+    values = [_fts_values(*row) for row in rows]
+    if values:
+        session.execute(text(
+            "INSERT INTO articles_fts (rowid, title, summary, key_points, content) "
+            "VALUES (:id, :title, :summary, :key_points, :content)"
+        ), values)
+
+
+def unindex_articles(session: Session, ids: List[int]):
+    """Remove articles from the search index; call before deleting them"""
+    if not _has_search_index(session) or not ids:
+        return
+
+    # A contentless table needs the original values to remove a row's terms
+    articles = session.query(Article).options(selectinload(Article.body)).filter(Article.id.in_(ids))
+    values = [
+        _fts_values(a.id, a.title, a.summary, a.key_points, a.content)
+        for a in articles
+    ]
+    if values:
+        session.execute(text(
+            "INSERT INTO articles_fts (articles_fts, rowid, title, summary, key_points, content) "
+            "VALUES ('delete', :id, :title, :summary, :key_points, :content)"
+        ), values)
+
+
+def ensure_search_index(session: Session):
+    """
+    Create the search index if needed, and index every stored article if it has never been filled
+
+    Only write paths call this (create_tables, save_articles and the other
+    writers, the 0002 migration); search_articles just checks the index.
+    """
+    if not _has_search_index(session):
+        return
+    # Databases created or upgraded without create_tables() have no FTS table yet
+    create_search_index(session.connection())
+    if session.execute(text("SELECT rowid FROM articles_fts LIMIT 1")).first() is not None:
+        return
+
+    last_id = 0
+    indexed = 0
+    while True:
+        articles = (
+            session.query(Article)
+            .options(selectinload(Article.body))
+            .filter(Article.id > last_id)
+            .order_by(Article.id)
+            .limit(INDEX_CHUNK_SIZE)
+            .all()
+        )
+        if not articles:
+            break
+
+        index_articles(session, [(a.id, a.title, a.summary, a.key_points, a.content) for a in articles])
+        last_id = articles[-1].id
+        indexed += len(articles)
+        session.expunge_all()
+
+    if indexed:
+        logger.info(f"Built search index for {indexed} articles")
+
+
+def _check_search_index(session: Session):
+    """Fail if the search index was never built; searching doesn't write to build it"""
+    if not inspect(session.get_bind()).has_table("articles_fts"):
+        raise RuntimeError(
+            "The database has no search index yet. Back it up and run "
+            "`alembic upgrade head` to build it (or `python main.py init` if "
+            "it is already up to date), then try again."
+        )
+    indexed = session.execute(text("SELECT rowid FROM articles_fts LIMIT 1")).first() is not None
+    if not indexed and session.query(Article.id).limit(1).first() is not None:
+        raise RuntimeError(
+            "The search index has not been filled yet. Run `python main.py init` "
+            "to index the stored articles, then try again."
+        )
+
+
+def _match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query: every word required, trailing * for prefixes"""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _stem(word: str) -> str:
+    """Crude suffix strip so highlighting roughly follows the porter-stemmed index"""
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.lower().endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def _snippet(texts: List[str], words: List[str], width: int = 30) -> SnippetSegments:
+    """Cut a window of about width words around the first match, marking matched words"""
+    pattern = re.compile(r"(" + "|".join(re.escape(_stem(w)) for w in words) + r")\w*", re.IGNORECASE)
+
+    for body in texts:
+        tokens = body.split()
+        hits = [i for i, token in enumerate(tokens) if pattern.match(token.strip("\"'([{"))]
+        if not hits:
+            continue
+
+        start = max(0, hits[0] - width // 3)
+        window = tokens[start:start + width]
+        segments: SnippetSegments = [("... ", False)] if start > 0 else []
+        for token in window:
+            segments.append((token, bool(pattern.match(token.strip("\"'([{")))))
+            segments.append((" ", False))
+        if start + width < len(tokens):
+            segments.append(("...", False))
+        return segments
+
+    first = next((body for body in texts if body), "")
+    return [(" ".join(first.split()[:width]), False)]
+
+
+def search_articles(database, query: str, limit: int = 10, category: Optional[str] = None) -> List[Dict]:
+    """
+    Search stored articles, best matches first
+
+    Returns:
+        Article dicts (title, url, source, category, published_date,
+        relevance_score) with a "snippet" of (text, is_match) segments
+    """
+    match = _match_expression(query)
+    if not match:
+        return []
+
+    session = database.get_session()
+    try:
+        if not _has_search_index(session):
+            raise RuntimeError("Full-text search needs the SQLite database")
+        # Nothing stored yet
+        if not inspect(session.get_bind()).has_table(Article.__tablename__):
+            return []
+        database.check_schema()
+        _check_search_index(session)
+
+        sql = f"SELECT rowid FROM articles_fts WHERE articles_fts MATCH :match ORDER BY {RANK}"
+        params = {"match": match, "limit": limit}
+        if category:
+            sql = (
+                f"SELECT articles_fts.rowid FROM articles_fts JOIN articles ON articles.id = articles_fts.rowid "
+                f"WHERE articles_fts MATCH :match AND articles.category = :category ORDER BY {RANK}"
+            )
+            params["category"] = category
+        ids = [row[0] for row in session.execute(text(sql + " LIMIT :limit"), params)]
+
+        articles = {
+            a.id: a for a in
+            session.query(Article).options(selectinload(Article.body)).filter(Article.id.in_(ids))
+        }
+
+        words = [word.rstrip("*") for word in query.split() if word.rstrip("*")]
+        results = []
+        for article_id in ids:
+            article = articles.get(article_id)
+            if article is None:
+                continue
+            result = article.to_dict()
+            result["snippet"] = _snippet(
+                [article.summary or "", _key_points_text(article.key_points), _plain_text(article.content), article.title],
+                words,
+            )
+            results.append(result)
+    finally:
+        session.close()
+
+    return results
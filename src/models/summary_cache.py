@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime
+from src.models.article import Base
+
+
+class SummaryCacheEntry(Base):
+    """Cached Claude summary keyed by a hash of model, prompt version and article text"""
+    __tablename__ = "summary_cache"
+
+    key = Column(String(64), primary_key=True)
+    result = Column(Text, nullable=False)  # JSON string of the parsed summary
+    created_date = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<SummaryCacheEntry(key='{self.key[:12]}...', created_date={self.created_date})>"
@@ -0,0 +1,3 @@
+from src.pipeline.streaming import StreamingPipeline
+
+__all__ = ["StreamingPipeline"]
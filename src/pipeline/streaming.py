@@ -0,0 +1,232 @@
+from queue import Empty, Full, Queue
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+import threading
+
+from src.metrics import metrics
+from src.models.persistence import save_articles
+from src.models.record import ArticleRecord
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# Seconds a blocked stage waits before re-checking whether the run was stopped
+_POLL_INTERVAL = 0.1
+
+
+class StreamingPipeline:
+    """
+    Run fetch -> filter -> summarize -> save as concurrent streaming stages
+
+    Each stage runs in its own thread and hands batches of article records to
+    the next through a bounded queue, so summarization starts with the first
+    parsed feed, articles are saved in batches as their summaries come back,
+    and at most queue_size batches wait between any two stages. If a stage
+    fails, the other stages stop and run() raises the error.
+    """
+
+    def __init__(
+        self,
+        database,
+        content_filter,
+        summarizer=None,
+        max_summarize: int = 20,
+        summarize_chunk_size: int = 8,
+        save_batch_size: int = 100,
+        queue_size: int = 4,
+        duplicate_history=None,
+        on_save: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            database: Database the articles are saved to
+            content_filter: ContentFilter applied to each fetched batch
+            summarizer: Optional AISummarizer; without it articles are saved unsummarized
+            max_summarize: Maximum articles summarized per run (cost control)
+            summarize_chunk_size: Articles gathered for each summarize_batch call
+            save_batch_size: Articles gathered for each save_articles transaction
+            queue_size: Maximum batches waiting between two stages
+            duplicate_history: Optional DuplicateHistory updated with each saved batch
+            on_save: Called with (saved, skipped) after each save transaction
+        """
+        self.database = database
+        self.content_filter = content_filter
+        self.summarizer = summarizer
+        self.max_summarize = max_summarize
+        self.summarize_chunk_size = max(1, summarize_chunk_size)
+        self.save_batch_size = max(1, save_batch_size)
+        self.queue_size = max(1, queue_size)
+        self.duplicate_history = duplicate_history
+        self.on_save = on_save
+
+    def _put(self, outbox: Queue, item) -> bool:
+        """Block until the item is queued; False if the run was stopped meanwhile"""
+        while not self._stop.is_set():
+            try:
+                outbox.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _receive(self, inbox: Queue) -> Iterator:
+        """Yield items from a queue until the upstream stage finishes or the run stops"""
+        while True:
+            try:
+                item = inbox.get(timeout=_POLL_INTERVAL)
+            except Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def _start(self, name: str, target: Callable, *args) -> threading.Thread:
+        def run():
+            try:
+                with metrics.timer("stage_seconds", stage=name):
+                    target(*args)
+            except Exception as e:
+                logger.error(f"Pipeline {name} stage failed: {e}")
+                self._errors.append(e)
+                self._stop.set()
+
+        thread = threading.Thread(target=run, name=f"pipeline-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    def _fetch_stage(self, batches: Iterable[List[ArticleRecord]], outbox: Queue):
+        try:
+            for batch in batches:
+                self._counts["fetched"] += len(batch)
+                if not self._put(outbox, batch):
+                    break
+        finally:
+            # Stop a fetcher generator (and its pending feeds) if the run ended early
+            if hasattr(batches, "close"):
+                batches.close()
+            self._put(outbox, _DONE)
+
+    def _filter_stage(self, inbox: Queue, outbox: Queue):
+        try:
+            for batch in self.content_filter.filter_stream(self._receive(inbox)):
+                self._counts["filtered"] += len(batch)
+                if not self._put(outbox, batch):
+                    break
+        finally:
+            self._put(outbox, _DONE)
+
+    def _summarize_chunk(self, chunk: List[ArticleRecord]) -> List[ArticleRecord]:
+        """
+        Summarize a chunk, passing it on unsummarized if the API call fails
+
+        Articles left out of summarize_batch's result (a Message Batch still
+        running) are saved without summaries, to be filled in by a later run.
+        """
+        try:
+            with metrics.timer("summarize_chunk_seconds"):
+                summarized = self.summarizer.summarize_batch(chunk, max_articles=len(chunk))
+            self._counts["summarized"] += len(summarized)
+            self._summarized_articles.extend(summarized)
+        except Exception as e:
+            logger.error(f"Error summarizing {len(chunk)} articles, saving them without summaries: {e}")
+        return chunk
+
+    def _summarize_stage(self, inbox: Queue, outbox: Queue):
+        try:
+            remaining = self.max_summarize if self.summarizer is not None else 0
+            pending = []
+
+            for batch in self._receive(inbox):
+                if remaining <= 0:
+                    if not self._put(outbox, batch):
+                        return
+                    continue
+
+                # Only the first max_summarize articles of the run are summarized
+                pending.extend(batch[:remaining])
+                passthrough = batch[remaining:]
+                remaining -= len(batch) - len(passthrough)
+
+                while len(pending) >= self.summarize_chunk_size or (pending and remaining <= 0):
+                    chunk = pending[:self.summarize_chunk_size]
+                    del pending[:self.summarize_chunk_size]
+                    if not self._put(outbox, self._summarize_chunk(chunk)):
+                        return
+
+                if passthrough and not self._put(outbox, passthrough):
+                    return
+
+            if pending and not self._stop.is_set():
+                self._put(outbox, self._summarize_chunk(pending))
+        finally:
+            self._put(outbox, _DONE)
+
+    def _save(self, articles: List[ArticleRecord]):
+        on_saved = self.duplicate_history.add if self.duplicate_history is not None else None
+        saved, skipped = save_articles(self.database, articles, on_saved=on_saved)
+
+        self._counts["saved"] += saved
+        self._counts["skipped"] += skipped
+        if self.on_save is not None:
+            self.on_save(saved, skipped)
+
+    def run(self, batches: Iterable[List[ArticleRecord]]) -> Dict:
+        """
+        Stream fetched batches (e.g. RSSFetcher.iter_all()) through the stages
+
+        Saving runs in the calling thread; the other stages run in their own.
+
+        Returns:
+            Dict with fetched, filtered, summarized, saved and skipped counts,
+            and summarized_articles (the articles that were summarized)
+        """
+        self._stop = threading.Event()
+        self._errors = []
+        self._counts = {"fetched": 0, "filtered": 0, "summarized": 0, "saved": 0, "skipped": 0}
+        self._summarized_articles = []
+
+        fetched = Queue(maxsize=self.queue_size)
+        filtered = Queue(maxsize=self.queue_size)
+        summarized = Queue(maxsize=self.queue_size)
+        threads = [
+            self._start("fetch", self._fetch_stage, batches, fetched),
+            self._start("filter", self._filter_stage, fetched, filtered),
+            self._start("summarize", self._summarize_stage, filtered, summarized),
+        ]
+
+        try:
+            with metrics.timer("stage_seconds", stage="save"):
+                pending = []
+                for batch in self._receive(summarized):
+                    pending.extend(batch)
+                    if len(pending) >= self.save_batch_size:
+                        self._save(pending)
+                        pending = []
+
+                if pending and not self._stop.is_set():
+                    self._save(pending)
+        except Exception:
+            self._stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        for stage in ("fetched", "filtered", "summarized", "saved", "skipped"):
+            metrics.increment("pipeline_articles", self._counts[stage], stage=stage)
+
+        logger.info(
+            f"Pipeline fetched {self._counts['fetched']}, kept {self._counts['filtered']}, "
+            f"summarized {self._counts['summarized']}, saved {self._counts['saved']} articles"
+        )
+        return dict(self._counts, summarized_articles=self._summarized_articles)
@@ -1,3 +1,5 @@
 from src.summarizer.ai_summarizer import AISummarizer
+from src.summarizer.batch_job import BatchJobStore
+from src.summarizer.summary_cache import SummaryCache
 
-__all__ = ["AISummarizer"]
+__all__ = ["AISummarizer", "BatchJobStore", "SummaryCache"]
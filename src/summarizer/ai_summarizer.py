@@ -1,25 +1,92 @@
 import os
 import json
-from typing import Dict, List, Optional
-from anthropic import Anthropic
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from src.metrics import metrics
+from src.models.record import ArticleRecord
+from src.summarizer.batch_job import BatchJobStore
+from src.summarizer.preprocess import ContentPreprocessor
+from src.summarizer.summary_cache import SummaryCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever the summarization prompt changes so cached summaries are not reused
+PROMPT_VERSION = "1"
+
+# Output tokens reserved per article in a packed prompt
+OUTPUT_TOKENS_PER_ARTICLE = 400
+
 
 class AISummarizer:
     """AI-powered article summarizer using Claude API"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-5-sonnet-20241022"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "claude-3-5-sonnet-20241022",
+        max_concurrency: int = 4,
+        max_retries: int = 4,
+        base_url: Optional[str] = None,
+        cache: Optional[SummaryCache] = None,
+        batch_token_budget: int = 0,
+        max_articles_per_prompt: int = 8,
+        batch_jobs: Optional[BatchJobStore] = None,
+        poll_interval: float = 30.0,
+        poll_timeout: float = 3600.0,
+        preprocessor: Optional[ContentPreprocessor] = None,
+    ):
+        """
+        Initialize the summarizer
+
+        Args:
+            api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY)
+            model: Claude model name
+            max_concurrency: Maximum requests in flight during summarize_batch (1 = sequential)
+            max_retries: Retries with exponential backoff on rate limits, overload and server errors
+            base_url: Override the API endpoint (defaults to ANTHROPIC_BASE_URL or the public API)
+            cache: Summary cache consulted before calling the API (optional)
+            batch_token_budget: Pack several articles into one prompt of up to this many
+                estimated input tokens during summarize_batch (0 = one article per request)
+            max_articles_per_prompt: Upper bound on articles packed into one prompt
+            batch_jobs: Submit summarize_batch as one asynchronous Message Batch, tracked
+                in this store so an interrupted run resumes instead of re-submitting.
+                Takes precedence over batch_token_budget (one request per article)
+            poll_interval: Seconds between Message Batch status checks
+            poll_timeout: Give up waiting after this many seconds; the batch keeps
+                running, its articles are returned unsummarized, and a later
+                run's collect_late_summaries() picks the summaries up
+            preprocessor: Strips HTML/boilerplate and fits content to a token budget
+        """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
 
-        self.client = Anthropic(api_key=self.api_key)
-        self.model = model
+        # Imported here: the SDK is slow to load and only needed once a summarizer exists
+        from anthropic import Anthropic
 
-    def summarize_article(self, article: Dict) -> Dict:
+        # The SDK retries 429/5xx itself, honoring retry-after headers between attempts
+        self.client = Anthropic(api_key=self.api_key, base_url=base_url, max_retries=max_retries)
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
+        self.batch_token_budget = max(0, batch_token_budget)
+        self.max_articles_per_prompt = max(1, max_articles_per_prompt)
+        self.batch_jobs = batch_jobs
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.preprocessor = preprocessor or ContentPreprocessor()
+
+        # Shared pause set from rate-limit headers so every worker backs off together
+        self._rate_limit_lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def summarize_article(self, article: ArticleRecord) -> Dict:
         """
         Summarize a single article and extract key information
 
@@ -29,10 +96,31 @@ class AISummarizer:
         - subtopic: detected subtopic
         - relevance_score: 0-100 score
         """
-        title = article.get("title", "")
-        content = article.get("content", article.get("description", ""))
-        category = article.get("category", "")
+        fields = self._article_fields(article)
+        result, cache_key = self._lookup(*fields)
+        if result is not None:
+            return result
+
+        return self._summarize_single(*fields, cache_key)
 
+    def _article_fields(self, article: ArticleRecord) -> Tuple[str, str, str]:
+        """
+        Return the title, preprocessed content and category used for prompting
+
+        Records the tokens preprocessing saved as article.prompt_tokens_saved.
+        """
+        content, tokens_saved = self.preprocessor.prepare(article.content or article.description)
+        article.prompt_tokens_saved = tokens_saved
+        return article.title, content, article.category
+
+    def _lookup(self, title: str, content: str, category: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Resolve an article without calling the API, if possible
+
+        Returns:
+            (result, cache_key) - result is a fallback for too-short content or a
+            cached summary, and None when the article still needs the API
+        """
         if not content or len(content) < 50:
             logger.warning(f"Skipping article with insufficient content: {title}")
             return {
@@ -40,23 +128,32 @@ class AISummarizer:
                 "key_points": [],
                 "subtopic": "",
                 "relevance_score": 30
-            }
+            }, None
+
+        if self.cache is None:
+            return None, None
 
+        cache_key = SummaryCache.make_key(self.model, PROMPT_VERSION, category, title, content)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Summary cache hit: {title[:50]}...")
+        metrics.increment("summary_cache_lookups", result="miss" if cached is None else "hit")
+        return cached, cache_key
+
+    def _summarize_single(self, title: str, content: str, category: str, cache_key: Optional[str]) -> Dict:
+        """Summarize one article with its own request"""
         prompt = self._create_summarization_prompt(title, content, category)
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response = self._create_message(prompt)
 
             result_text = response.content[0].text
             result = self._parse_response(result_text)
 
+            # Don't cache parse failures, so the next run retries them
+            if cache_key is not None and result["summary"]:
+                self.cache.put(cache_key, result)
+
             logger.info(f"Successfully summarized: {title[:50]}...")
             return result
 
@@ -69,13 +166,67 @@ class AISummarizer:
                 "relevance_score": 50
             }
 
-    def _create_summarization_prompt(self, title: str, content: str, category: str) -> str:
-        """Create the prompt for Claude"""
-        # Truncate content if too long (to manage token costs)
-        max_content_length = 3000
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "..."
+    def _create_message(self, prompt: str, max_tokens: int = 1000):
+        """Send a prompt to Claude, waiting out any rate-limit pause first"""
+        self._wait_for_rate_limit()
+
+        with metrics.timer("summarize_request_seconds"):
+            raw_response = self.client.messages.with_raw_response.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=0,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
 
+        self._update_rate_limit(raw_response.headers)
+        response = raw_response.parse()
+        self._record_usage(response, api="messages")
+        return response
+
+    @staticmethod
+    def _record_usage(message, api: str):
+        """Count the tokens a response was billed for"""
+        usage = getattr(message, "usage", None)
+        if usage is None:
+            return
+        metrics.increment("summarize_requests", api=api)
+        metrics.increment("summarize_tokens", usage.input_tokens, api=api, type="input")
+        metrics.increment("summarize_tokens", usage.output_tokens, api=api, type="output")
+
+    def _wait_for_rate_limit(self):
+        """Sleep until the shared rate-limit pause (if any) has passed"""
+        with self._rate_limit_lock:
+            delay = self._paused_until - time.monotonic()
+
+        if delay > 0:
+            logger.info(f"Rate limit reached, waiting {delay:.1f}s")
+            time.sleep(delay)
+
+    def _update_rate_limit(self, headers):
+        """Pause new requests when the API reports no remaining request or token budget"""
+        for limit in ("requests", "tokens"):
+            remaining = headers.get(f"anthropic-ratelimit-{limit}-remaining")
+            reset = headers.get(f"anthropic-ratelimit-{limit}-reset")
+
+            if remaining is None or reset is None:
+                continue
+
+            try:
+                if int(remaining) > 0:
+                    continue
+                reset_at = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+            except ValueError:
+                continue
+
+            delay = (reset_at - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                with self._rate_limit_lock:
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def _create_summarization_prompt(self, title: str, content: str, category: str) -> str:
+        """Create the prompt for Claude (content is expected to be preprocessed)"""
         return f"""You are a news analysis assistant. Analyze the following {category} article and provide:
 
 1. A concise 2-3 sentence summary focusing on the most important information
@@ -97,6 +248,49 @@ Return your response in this exact JSON format:
 
 Only return the JSON, no additional text."""
 
+    def _create_batch_prompt(self, items: List[Tuple[str, str, str]]) -> str:
+        """Create one prompt covering several (title, content, category) items"""
+        blocks = []
+        for i, (title, content, category) in enumerate(items, 1):
+            blocks.append(f"""[Article {i}]
+Category: {category}
+Title: {title}
+
+Content: {content}""")
+        articles_text = "\n\n".join(blocks)
+
+        return f"""You are a news analysis assistant. Analyze each of the following {len(items)} articles and provide, for every article:
+
+1. A concise 2-3 sentence summary focusing on the most important information
+2. 3-5 key bullet points highlighting the main facts, figures, or takeaways
+3. The specific subtopic (e.g., "AI/ML", "Cloud Computing", "Stock Market", "IPO", etc.)
+4. A relevance score from 0-100 (based on importance and actionability for professionals)
+
+{articles_text}
+
+Return your response as a JSON array with one object per article, in this exact format:
+[
+  {{
+    "id": 1,
+    "summary": "Your 2-3 sentence summary here",
+    "key_points": ["Point 1", "Point 2", "Point 3"],
+    "subtopic": "Specific subtopic",
+    "relevance_score": 85
+  }}
+]
+
+Use the article number as "id". Only return the JSON array, no additional text."""
+
+    def _normalize_result(self, result: Dict) -> Dict:
+        """Fill in any fields missing from a parsed summary"""
+        required_fields = ["summary", "key_points", "subtopic", "relevance_score"]
+        for field in required_fields:
+            if field not in result:
+                result[field] = "" if field != "key_points" else []
+                if field == "relevance_score":
+                    result[field] = 50
+        return result
+
     def _parse_response(self, response_text: str) -> Dict:
         """Parse Claude's JSON response"""
         try:
@@ -111,14 +305,7 @@ Only return the JSON, no additional text."""
             result = json.loads(json_str)
 
             # Validate required fields
-            required_fields = ["summary", "key_points", "subtopic", "relevance_score"]
-            for field in required_fields:
-                if field not in result:
-                    result[field] = "" if field != "key_points" else []
-                    if field == "relevance_score":
-                        result[field] = 50
-
-            return result
+            return self._normalize_result(result)
 
         except Exception as e:
             logger.error(f"Error parsing Claude response: {e}")
@@ -130,32 +317,347 @@ Only return the JSON, no additional text."""
                 "relevance_score": 50
             }
 
-    def summarize_batch(self, articles: List[Dict], max_articles: int = 10) -> List[Dict]:
+    def _parse_batch_response(self, response_text: str, count: int) -> List[Optional[Dict]]:
+        """
+        Split Claude's JSON array response back into per-article results
+
+        Returns:
+            One entry per article in prompt order; None where the article is
+            missing from the response or has no summary
+        """
+        results: List[Optional[Dict]] = [None] * count
+
+        try:
+            start_idx = response_text.find("[")
+            end_idx = response_text.rfind("]") + 1
+
+            if start_idx == -1 or end_idx == 0:
+                raise ValueError("No JSON array found in response")
+
+            items = json.loads(response_text[start_idx:end_idx])
+
+        except Exception as e:
+            logger.error(f"Error parsing batched Claude response: {e}")
+            logger.debug(f"Response text: {response_text}")
+            return results
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.pop("id")) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < count and results[index] is None and item.get("summary"):
+                results[index] = self._normalize_result(item)
+
+        return results
+
+    def _pack_prompts(self, items: List[Tuple[str, str, str]]) -> List[List[int]]:
+        """Group item indices so each group's prompt stays within batch_token_budget"""
+        overhead = self.preprocessor.count_tokens(self._create_batch_prompt([]))
+        groups: List[List[int]] = []
+        current: List[int] = []
+        used = overhead
+
+        for i, (title, content, category) in enumerate(items):
+            cost = self.preprocessor.count_tokens(title + category + content) + 10
+            if current and (used + cost > self.batch_token_budget
+                            or len(current) >= self.max_articles_per_prompt):
+                groups.append(current)
+                current = []
+                used = overhead
+            current.append(i)
+            used += cost
+
+        if current:
+            groups.append(current)
+        return groups
+
+    def _summarize_packed(self, items: List[Tuple[str, str, str]]) -> List[Optional[Dict]]:
+        """Summarize several articles with one request; None marks items that failed"""
+        if len(items) == 1:
+            return [None]
+
+        prompt = self._create_batch_prompt(items)
+        max_tokens = min(8192, OUTPUT_TOKENS_PER_ARTICLE * len(items))
+
+        try:
+            response = self._create_message(prompt, max_tokens=max_tokens)
+            results = self._parse_batch_response(response.content[0].text, len(items))
+        except Exception as e:
+            logger.error(f"Error summarizing batch of {len(items)} articles: {e}")
+            return [None] * len(items)
+
+        done = sum(result is not None for result in results)
+        logger.info(f"Summarized {done}/{len(items)} articles in one request")
+        return results
+
+    def _summarize_all_packed(self, batch: List[ArticleRecord], map_fn) -> List[Dict]:
+        """
+        Summarize a batch by packing articles into shared prompts
+
+        Cached and too-short articles are resolved first; items a packed request
+        fails to return are retried with single-article requests.
+        """
+        fields = [self._article_fields(article) for article in batch]
+        results: List[Optional[Dict]] = [None] * len(batch)
+        cache_keys: List[Optional[str]] = [None] * len(batch)
+        pending: List[int] = []
+
+        for i in range(len(batch)):
+            results[i], cache_keys[i] = self._lookup(*fields[i])
+            if results[i] is None:
+                pending.append(i)
+
+        items = [fields[i] for i in pending]
+        groups = [[pending[j] for j in group] for group in self._pack_prompts(items)]
+        logger.info(f"Packing {len(pending)} articles into {len(groups)} requests")
+
+        def summarize_group(group):
+            return self._summarize_packed([fields[i] for i in group])
+
+        failed = []
+        for group, group_results in zip(groups, map_fn(summarize_group, groups)):
+            for i, result in zip(group, group_results):
+                if result is None:
+                    failed.append(i)
+                    continue
+                results[i] = result
+                if cache_keys[i] is not None:
+                    self.cache.put(cache_keys[i], result)
+
+        if failed:
+            logger.info(f"Falling back to single requests for {len(failed)} articles")
+
+        def summarize_one(i):
+            return self._summarize_single(*fields[i], cache_keys[i])
+
+        for i, result in zip(failed, map_fn(summarize_one, failed)):
+            results[i] = result
+
+        return results
+
+    def _message_batches(self):
+        """Message Batches resource (beta namespace on older SDKs)"""
+        batches = getattr(self.client.messages, "batches", None)
+        return batches if batches is not None else self.client.beta.messages.batches
+
+    def _submit_message_batch(self, prompts: Dict[str, str]) -> str:
+        """Submit one request per custom id and return the batch id"""
+        requests = [
+            {
+                "custom_id": custom_id,
+                "params": {
+                    "model": self.model,
+                    "max_tokens": 1000,
+                    "temperature": 0,
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            }
+            for custom_id, prompt in prompts.items()
+        ]
+        message_batch = self._message_batches().create(requests=requests)
+        logger.info(f"Submitted message batch {message_batch.id} with {len(requests)} requests")
+        return message_batch.id
+
+    def _collect_message_batch(self, batch_id: str, deadline: float) -> Dict[str, Dict]:
+        """Wait for a batch to end and return parsed summaries by custom id"""
+        batches = self._message_batches()
+
+        while True:
+            message_batch = batches.retrieve(batch_id)
+            if message_batch.processing_status == "ended":
+                break
+            if time.monotonic() + self.poll_interval > deadline:
+                raise TimeoutError(f"Message batch {batch_id} still {message_batch.processing_status}")
+            logger.info(f"Message batch {batch_id} is {message_batch.processing_status}, "
+                        f"checking again in {self.poll_interval:.0f}s")
+            time.sleep(self.poll_interval)
+
+        results = {}
+        for entry in batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                logger.warning(f"Batch request {entry.custom_id[:12]}... {entry.result.type}")
+                continue
+            self._record_usage(entry.result.message, api="batches")
+            result = self._parse_response(entry.result.message.content[0].text)
+            if result["summary"]:
+                results[entry.custom_id] = result
+
+        logger.info(f"Collected {len(results)} summaries from message batch {batch_id}")
+        return results
+
+    def _summarize_all_offline(self, batch: List[ArticleRecord], map_fn) -> List[Optional[Dict]]:
+        """
+        Summarize a batch through the Message Batches API
+
+        Articles are keyed by content hash, so a restarted run picks up batches it
+        already submitted rather than paying for them twice. Requests that errored
+        or expired fall back to single interactive requests. Articles whose batch
+        is still running at poll_timeout get None; their URLs stay recorded so
+        collect_late_summaries() can fill them in later.
+        """
+        fields = [self._article_fields(article) for article in batch]
+        results: List[Optional[Dict]] = [None] * len(batch)
+        cache_keys: List[Optional[str]] = [None] * len(batch)
+        custom_ids: Dict[int, str] = {}
+
+        for i in range(len(batch)):
+            results[i], cache_keys[i] = self._lookup(*fields[i])
+            if results[i] is None:
+                title, content, category = fields[i]
+                custom_ids[i] = cache_keys[i] or SummaryCache.make_key(
+                    self.model, PROMPT_VERSION, category, title, content
+                )
+
+        submitted = self.batch_jobs.submitted_ids()
+        prompts = {}
+        urls: Dict[str, List[str]] = {}
+        for i, custom_id in custom_ids.items():
+            urls.setdefault(custom_id, []).append(batch[i].url)
+            if custom_id not in submitted and custom_id not in self.batch_jobs.results:
+                prompts[custom_id] = self._create_summarization_prompt(*fields[i])
+        self.batch_jobs.add_urls(urls)
+
+        # Only wait for batches holding this run's articles; older ones are left to collect_late_summaries
+        batch_ids = {submitted[cid] for cid in urls if cid in submitted}
+        if batch_ids:
+            logger.info(f"Resuming {len(batch_ids)} previously submitted message batches")
+
+        if prompts:
+            batch_id = self._submit_message_batch(prompts)
+            self.batch_jobs.add_batch(batch_id, list(prompts))
+            batch_ids.add(batch_id)
+
+        # Batch ids are saved before waiting, so a timeout or crash leaves them for the next run
+        deadline = time.monotonic() + self.poll_timeout
+        pending = set()
+        for batch_id in sorted(batch_ids):
+            try:
+                self.batch_jobs.finish_batch(batch_id, self._collect_message_batch(batch_id, deadline))
+            except TimeoutError as e:
+                logger.warning(f"{e}; its summaries will be written to the saved articles by a later run")
+                pending.update(self.batch_jobs.batches.get(batch_id, []))
+
+        collected = self.batch_jobs.pop_results(list(urls))
+
+        failed = []
+        for i, custom_id in custom_ids.items():
+            if custom_id in pending:
+                continue
+            if custom_id not in collected:
+                failed.append(i)
+                continue
+            results[i] = collected[custom_id]
+            if cache_keys[i] is not None:
+                self.cache.put(cache_keys[i], results[i])
+
+        if failed:
+            logger.info(f"Falling back to single requests for {len(failed)} articles")
+
+        def summarize_one(i):
+            return self._summarize_single(*fields[i], cache_keys[i])
+
+        for i, result in zip(failed, map_fn(summarize_one, failed)):
+            results[i] = result
+
+        return results
+
+    def collect_late_summaries(self) -> Dict[str, Dict]:
+        """
+        Collect Message Batches that outlived earlier runs
+
+        Checks each outstanding batch once, without waiting. Summaries from the
+        batches that have ended are cached and returned for the articles that
+        were saved without them.
+
+        Returns:
+            Summary dicts by article URL (empty without batch_jobs)
+        """
+        if self.batch_jobs is None:
+            return {}
+
+        for batch_id in sorted(set(self.batch_jobs.submitted_ids().values())):
+            try:
+                self.batch_jobs.finish_batch(batch_id, self._collect_message_batch(batch_id, time.monotonic()))
+            except TimeoutError as e:
+                logger.info(f"{e}; checking again next run")
+
+        custom_ids = list(self.batch_jobs.results)
+        urls = self.batch_jobs.urls_for(custom_ids)
+        late = {}
+        for custom_id, result in self.batch_jobs.pop_results(custom_ids).items():
+            # Custom ids are summary cache keys, so these stay reusable
+            if self.cache is not None:
+                self.cache.put(custom_id, result)
+            for url in urls.get(custom_id, []):
+                late[url] = result
+
+        if late:
+            logger.info(f"Collected {len(late)} summaries from earlier message batches")
+        return late
+
+    def summarize_batch(self, articles: List[ArticleRecord], max_articles: int = 10) -> List[ArticleRecord]:
         """
         Summarize multiple articles
 
+        Up to max_concurrency requests run in parallel; results keep the input order.
+        With batch_token_budget set, several articles share each request; with
+        batch_jobs set, the whole batch goes through the Message Batches API.
+
         Args:
-            articles: List of article dictionaries
+            articles: List of article records
             max_articles: Maximum number of articles to process (to control costs)
 
         Returns:
-            List of articles with added summary information
+            List of articles with added summary information (articles whose
+            Message Batch did not end within poll_timeout are left out)
         """
-        summarized = []
+        batch = articles[:max_articles]
+
+        def summarize(item):
+            i, article = item
+            logger.info(f"Summarizing article {i+1}/{len(batch)}")
+            return self.summarize_article(article)
 
-        for i, article in enumerate(articles[:max_articles]):
-            logger.info(f"Summarizing article {i+1}/{min(len(articles), max_articles)}")
+        executor = None
+        if self.max_concurrency > 1 and len(batch) > 1:
+            executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batch)))
 
-            summary_data = self.summarize_article(article)
+        def map_fn(fn, items):
+            if executor is None:
+                return [fn(item) for item in items]
+            return list(executor.map(fn, items))
+
+        try:
+            if self.batch_jobs is not None:
+                results = self._summarize_all_offline(batch, map_fn)
+            elif self.batch_token_budget:
+                results = self._summarize_all_packed(batch, map_fn)
+            else:
+                results = map_fn(summarize, enumerate(batch))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        summarized = []
+
+        for article, summary_data in zip(batch, results):
+            if summary_data is None:
+                continue
 
             # Add summary data to article
-            article["summary"] = summary_data["summary"]
-            article["key_points"] = json.dumps(summary_data["key_points"])  # Store as JSON string
-            article["subtopic"] = summary_data["subtopic"]
-            article["relevance_score"] = summary_data["relevance_score"]
+            article.summary = summary_data["summary"]
+            article.key_points = summary_data["key_points"]  # Serialized to JSON on save
+            article.subtopic = summary_data["subtopic"]
+            article.relevance_score = summary_data["relevance_score"]
 
             summarized.append(article)
 
+        tokens_saved = sum(article.prompt_tokens_saved for article in batch)
+        logger.info(f"Preprocessing saved ~{tokens_saved} prompt tokens across {len(batch)} articles")
+
         return summarized
 
 
@@ -166,11 +668,11 @@ if __name__ == "__main__":
 
     summarizer = AISummarizer()
 
-    test_article = {
-        "title": "OpenAI Launches GPT-5 with Revolutionary Capabilities",
-        "content": "OpenAI has announced the launch of GPT-5, their latest language model. The new model shows significant improvements in reasoning, coding, and multimodal understanding. CEO Sam Altman stated that GPT-5 represents a major leap forward in AI capabilities, with improved accuracy and reduced hallucinations. The model will be available through their API starting next month.",
-        "category": "tech"
-    }
+    test_article = ArticleRecord(
+        title="OpenAI Launches GPT-5 with Revolutionary Capabilities",
+        content="OpenAI has announced the launch of GPT-5, their latest language model. The new model shows significant improvements in reasoning, coding, and multimodal understanding. CEO Sam Altman stated that GPT-5 represents a major leap forward in AI capabilities, with improved accuracy and reduced hallucinations. The model will be available through their API starting next month.",
+        category="tech"
+    )
 
     result = summarizer.summarize_article(test_article)
     print("\nSummary Result:")
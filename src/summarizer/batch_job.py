@@ -0,0 +1,109 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BatchJobStore:
+    """
+    Persistent record of submitted Message Batches and their collected results
+
+    Alongside each submitted request it keeps the URLs of the articles it
+    summarizes, so summaries that arrive after their articles were saved (the
+    batch outlived the run) can be written back to the stored rows.
+    """
+
+    def __init__(self, state_file: str = None):
+        if state_file is None:
+            state_file = Path(__file__).parent.parent.parent / "data" / "summary_batches.json"
+
+        self.state_file = Path(state_file)
+        self._lock = threading.Lock()
+        state = self._load()
+        # batch id -> custom ids submitted in that batch
+        self.batches: Dict[str, List[str]] = state.get("batches", {})
+        # custom id -> parsed summary, kept until a run consumes it
+        self.results: Dict[str, Dict] = state.get("results", {})
+        # custom id -> URLs of the articles waiting for that summary
+        self.urls: Dict[str, List[str]] = state.get("urls", {})
+
+    def _load(self) -> Dict:
+        """Load batch state from disk"""
+        if not self.state_file.exists():
+            return {}
+
+        try:
+            with open(self.state_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading batch state: {e}")
+            return {}
+
+    def submitted_ids(self) -> Dict[str, str]:
+        """Map each custom id still awaiting results to its batch id"""
+        with self._lock:
+            return {
+                custom_id: batch_id
+                for batch_id, custom_ids in self.batches.items()
+                for custom_id in custom_ids
+            }
+
+    def add_urls(self, urls: Dict[str, List[str]]):
+        """Remember which article URLs are waiting for each custom id"""
+        with self._lock:
+            for custom_id, article_urls in urls.items():
+                known = self.urls.setdefault(custom_id, [])
+                known.extend(url for url in article_urls if url not in known)
+        self.save()
+
+    def urls_for(self, custom_ids: List[str]) -> Dict[str, List[str]]:
+        """The article URLs recorded for these custom ids"""
+        with self._lock:
+            return {cid: list(self.urls[cid]) for cid in custom_ids if cid in self.urls}
+
+    def add_batch(self, batch_id: str, custom_ids: List[str]):
+        """Record a newly submitted batch and write it to disk immediately"""
+        with self._lock:
+            self.batches[batch_id] = list(custom_ids)
+        self.save()
+
+    def finish_batch(self, batch_id: str, results: Dict[str, Dict]):
+        """Store a finished batch's results and forget the batch"""
+        with self._lock:
+            self.results.update(results)
+            # Requests that errored or expired will never get a summary from this batch
+            for custom_id in self.batches.pop(batch_id, []):
+                if custom_id not in results:
+                    self.urls.pop(custom_id, None)
+        self.save()
+
+    def pop_results(self, custom_ids: List[str]) -> Dict[str, Dict]:
+        """Take the collected results for these custom ids out of the store"""
+        with self._lock:
+            taken = {cid: self.results.pop(cid) for cid in custom_ids if cid in self.results}
+            for custom_id in taken:
+                self.urls.pop(custom_id, None)
+        if taken:
+            self.save()
+        return taken
+
+    def save(self):
+        """Write the state to disk, removing the file once nothing is outstanding"""
+        with self._lock:
+            try:
+                if not self.batches and not self.results and not self.urls:
+                    if self.state_file.exists():
+                        self.state_file.unlink()
+                    return
+
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.state_file.with_suffix(".tmp")
+                with open(tmp_file, "w") as f:
+                    json.dump({"batches": self.batches, "results": self.results, "urls": self.urls}, f, indent=2)
+                tmp_file.replace(self.state_file)
+            except Exception as e:
+                logger.error(f"Error saving batch state: {e}")
@@ -0,0 +1,129 @@
+import html
+import re
+from typing import Optional, Tuple
+import logging
+
+from bs4 import BeautifulSoup
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Elements whose text is never part of the article body
+DROPPED_TAGS = ["script", "style", "noscript", "iframe", "svg", "figure", "nav", "aside", "footer", "form", "button"]
+
+# Block elements that start a new line when flattened to text
+BLOCK_TAGS = ["p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "tr", "section", "article"]
+
+# Feed boilerplate lines (matched against the lowercased, stripped line)
+BOILERPLATE_PATTERNS = [
+    r"^the post .* appeared first on .*$",
+    r"^this (article|story|post) (was )?(originally )?(appeared|published) (first )?(on|in) .*$",
+    r"^(continue|keep) reading.*$",
+    r"^read (more|the full (story|article)).*$",
+    r"^(click|tap) here.*$",
+    r"^(sign up|subscribe) (for|to) .*$",
+    r"^(share|follow us) (this|on) .*$",
+    r"^(advertisement|sponsored content)$",
+    r"^(©|copyright|all rights reserved).*$",
+    r"^related( articles| stories| coverage)?:.*$",
+    r"^(image|photo)( credit)?:.*$",
+]
+
+_looks_like_html = re.compile(r"<[a-zA-Z/!][^>]*>")
+
+
+class ContentPreprocessor:
+    """Turn raw feed content into compact plain text sized for a prompt"""
+
+    def __init__(self, max_tokens: int = 750, encoding: Optional[str] = None):
+        """
+        Initialize content preprocessor
+
+        Tokens are estimated as one per 4 characters. Claude's tokenizer is not
+        public, so any count is an estimate; a tiktoken encoding only makes it a
+        closer one.
+
+        Args:
+            max_tokens: Token budget for an article's content in a prompt
+            encoding: Optional tiktoken encoding to count with instead (e.g.
+                "cl100k_base"). Needs the optional tiktoken package, and tiktoken
+                downloads the encoding on first use unless it is already in
+                TIKTOKEN_CACHE_DIR; if either fails, the estimate is used.
+        """
+        self.max_tokens = max_tokens
+        self._boilerplate = re.compile("|".join(f"(?:{p})" for p in BOILERPLATE_PATTERNS))
+        self._encoding = self._load_encoding(encoding) if encoding else None
+
+    @staticmethod
+    def _load_encoding(name: str):
+        """Load a tiktoken encoding, or None (with a warning) if it is unavailable"""
+        try:
+            import tiktoken
+
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.warning(f"tiktoken encoding {name!r} unavailable ({e}); estimating 4 characters per token")
+            return None
+
+    def count_tokens(self, text: str) -> int:
+        """Estimate how many tokens a text costs"""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // 4 + 1
+
+    def html_to_text(self, content: str) -> str:
+        """Strip markup, keeping paragraph breaks"""
+        if not _looks_like_html.search(content):
+            return html.unescape(content)
+
+        soup = BeautifulSoup(content, "html.parser")
+        for tag in soup(DROPPED_TAGS):
+            tag.decompose()
+        for tag in soup(BLOCK_TAGS):
+            tag.insert_before("\n")
+            tag.insert_after("\n")
+
+        return soup.get_text()
+
+    def strip_boilerplate(self, text: str) -> str:
+        """Drop boilerplate lines and collapse whitespace"""
+        lines = []
+        for line in text.splitlines():
+            line = " ".join(line.split())
+            if line and not self._boilerplate.match(line.lower()):
+                lines.append(line)
+        return "\n".join(lines)
+
+    def truncate(self, text: str) -> str:
+        """Cut text down to max_tokens, preferring a sentence or word boundary"""
+        if self.count_tokens(text) <= self.max_tokens:
+            return text
+
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            text = self._encoding.decode(tokens[:self.max_tokens])
+        else:
+            text = text[:self.max_tokens * 4]
+
+        # Back off to the last sentence end, or failing that the last space
+        cut = max(text.rfind(". "), text.rfind(".\n"))
+        if cut < len(text) // 2:
+            cut = text.rfind(" ")
+        if cut > 0:
+            text = text[:cut + 1]
+
+        return text.rstrip() + "..."
+
+    def prepare(self, content: str) -> Tuple[str, int]:
+        """
+        Clean and fit content for a prompt
+
+        Returns:
+            (text, tokens_saved) - the prompt-ready text and how many tokens it
+            saves compared to the raw content
+        """
+        if not content:
+            return "", 0
+
+        text = self.truncate(self.strip_boilerplate(self.html_to_text(content)))
+        return text, max(0, self.count_tokens(content) - self.count_tokens(text))
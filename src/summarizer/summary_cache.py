@@ -0,0 +1,141 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import logging
+
+from src.models.summary_cache import SummaryCacheEntry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Entries deleted per eviction transaction (kept under SQLite's bound-parameter limit)
+DELETE_CHUNK_SIZE = 500
+
+
+class SummaryCache:
+    """Persistent, content-addressed cache of article summaries"""
+
+    def __init__(self, database, ttl_days: int = 30, max_entries: int = 10000):
+        """
+        Initialize summary cache
+
+        Args:
+            database: Database holding the summary_cache table
+            ttl_days: Entries older than this are ignored and evicted
+            max_entries: Oldest entries beyond this count are evicted
+        """
+        self.database = database
+        self.ttl = timedelta(days=ttl_days)
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, category: str, title: str, content: str) -> str:
+        """Hash everything that determines the summary; whitespace is normalized"""
+        normalized = "\x1f".join([
+            model,
+            prompt_version,
+            category,
+            " ".join(title.split()),
+            " ".join(content.split()),
+        ])
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached summary for a key, or None on a miss"""
+        session = self.database.get_session()
+        try:
+            entry = session.get(SummaryCacheEntry, key)
+            result = None
+            if entry is not None and entry.created_date >= datetime.utcnow() - self.ttl:
+                result = json.loads(entry.result)
+        except Exception as e:
+            logger.error(f"Error reading summary cache: {e}")
+            result = None
+        finally:
+            session.close()
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return result
+
+    def put(self, key: str, result: Dict):
+        """Store a summary under a key"""
+        session = self.database.get_session()
+        try:
+            session.merge(SummaryCacheEntry(
+                key=key,
+                result=json.dumps(result),
+                created_date=datetime.utcnow(),
+            ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error writing summary cache: {e}")
+        finally:
+            session.close()
+
+    def evict(self, chunk_size: int = DELETE_CHUNK_SIZE) -> int:
+        """Delete expired entries and the oldest entries beyond max_entries, chunk_size per transaction"""
+        cutoff = datetime.utcnow() - self.ttl
+        deleted = 0
+
+        while True:
+            count = self._delete_oldest(chunk_size, SummaryCacheEntry.created_date < cutoff)
+            deleted += count
+            if count < chunk_size:
+                break
+
+        session = self.database.get_session()
+        try:
+            overflow = session.query(SummaryCacheEntry).count() - self.max_entries
+        finally:
+            session.close()
+
+        while overflow > 0:
+            count = self._delete_oldest(min(chunk_size, overflow))
+            if not count:
+                break
+            deleted += count
+            overflow -= count
+
+        if deleted:
+            logger.info(f"Evicted {deleted} summary cache entries")
+        return deleted
+
+    def _delete_oldest(self, limit: int, *criteria) -> int:
+        """Delete up to limit of the oldest entries matching the criteria in one transaction"""
+        session = self.database.get_session()
+        try:
+            keys = [
+                key for (key,) in
+                session.query(SummaryCacheEntry.key)
+                .filter(*criteria)
+                .order_by(SummaryCacheEntry.created_date)
+                .limit(limit)
+            ]
+            if not keys:
+                return 0
+
+            deleted = session.query(SummaryCacheEntry).filter(
+                SummaryCacheEntry.key.in_(keys)
+            ).delete(synchronize_session=False)
+            session.commit()
+        finally:
+            session.close()
+
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for this process"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -5,8 +5,10 @@ Sends news summaries to WhatsApp
 
 import os
 from twilio.rest import Client
-from typing import List, Dict
-import json
+from typing import List
+
+from src.metrics import metrics
+from src.models.record import ArticleRecord
 
 
 class WhatsAppNotifier:
@@ -23,56 +25,51 @@ class WhatsAppNotifier:
 
         self.client = Client(self.account_sid, self.auth_token)
 
-    def format_article(self, article: Dict, index: int, compact: bool = False) -> str:
+    def format_article(self, article: ArticleRecord, index: int, compact: bool = False) -> str:
         """Format a single article for WhatsApp"""
         if compact:
             # Ultra-compact format for fitting more articles
-            lines = [f"\n*{index}. {article['title'][:80]}*"]
-            lines.append(f"⭐{article['relevance_score']} | {article['source']}")
+            lines = [f"\n*{index}. {article.title[:80]}*"]
+            lines.append(f"⭐{article.relevance_score} | {article.source}")
 
-            if article.get('summary'):
+            if article.summary:
                 # Truncate summary to 150 chars
-                summary = article['summary'][:150]
-                if len(article['summary']) > 150:
+                summary = article.summary[:150]
+                if len(article.summary) > 150:
                     summary += "..."
                 lines.append(summary)
 
-            lines.append(f"🔗 {article['url']}")
+            lines.append(f"🔗 {article.url}")
             lines.append("")
 
         else:
             # Standard format with more detail
-            lines = [f"\n*[{index}] {article['title']}*"]
-            lines.append(f"📰 {article['source']} | ⭐ {article['relevance_score']}/100")
-
-            if article.get('subtopic'):
-                lines.append(f"🏷️ {article['subtopic']}")
-
-            if article.get('summary'):
-                lines.append(f"\n{article['summary']}")
-
-            if article.get('key_points'):
-                try:
-                    points = json.loads(article['key_points'])
-                    if points:
-                        lines.append("\n*Key Points:*")
-                        for point in points[:3]:  # Limit to 3 points for brevity
-                            lines.append(f"• {point}")
-                except:
-                    pass
-
-            lines.append(f"\n🔗 {article['url']}")
+            lines = [f"\n*[{index}] {article.title}*"]
+            lines.append(f"📰 {article.source} | ⭐ {article.relevance_score}/100")
+
+            if article.subtopic:
+                lines.append(f"🏷️ {article.subtopic}")
+
+            if article.summary:
+                lines.append(f"\n{article.summary}")
+
+            if article.key_points:
+                lines.append("\n*Key Points:*")
+                for point in article.key_points[:3]:  # Limit to 3 points for brevity
+                    lines.append(f"• {point}")
+
+            lines.append(f"\n🔗 {article.url}")
             lines.append("-" * 40)
 
         return "\n".join(lines)
 
-    def format_summary(self, articles: List[Dict], category: str = "all", compact: bool = False) -> str:
+    def format_summary(self, articles: List[ArticleRecord], category: str = "all", compact: bool = False) -> str:
         """Format all articles into a WhatsApp message"""
         header = f"📰 *Daily News - {category.upper()}*\n"
         header += f"📊 {len(articles)} articles"
 
         # Calculate average relevance
-        avg_relevance = sum(a.get('relevance_score', 50) for a in articles) / len(articles) if articles else 0
+        avg_relevance = sum(a.relevance_score for a in articles) / len(articles) if articles else 0
         header += f" | ⭐ Avg: {avg_relevance:.0f}/100\n"
 
         if not compact:
@@ -115,24 +112,27 @@ class WhatsAppNotifier:
 
             # Send all message parts
             for i, msg in enumerate(messages):
-                response = self.client.messages.create(
-                    from_=self.from_whatsapp,
-                    body=msg,
-                    to=self.to_whatsapp
-                )
+                with metrics.timer("whatsapp_send_seconds"):
+                    response = self.client.messages.create(
+                        from_=self.from_whatsapp,
+                        body=msg,
+                        to=self.to_whatsapp
+                    )
+                metrics.increment("whatsapp_messages", status="sent")
                 print(f"Message {i+1}/{len(messages)} sent: {response.sid}")
 
             return True
 
         except Exception as e:
+            metrics.increment("whatsapp_messages", status="error")
             print(f"Error sending WhatsApp message: {e}")
             return False
 
-    def send_daily_digest(self, articles: List[Dict], category: str = "all", limit: int = 20, compact: bool = True) -> bool:
+    def send_daily_digest(self, articles: List[ArticleRecord], category: str = "all", limit: int = 20, compact: bool = True) -> bool:
         """Send daily digest of top articles
 
         Args:
-            articles: List of article dicts
+            articles: List of article records
             category: 'tech', 'investment', or 'all'
             limit: Number of top articles to send (default 20)
             compact: Use compact format to fit more articles (default True)
@@ -140,7 +140,7 @@ class WhatsAppNotifier:
         # Sort by relevance and take top N
         sorted_articles = sorted(
             articles,
-            key=lambda x: x.get('relevance_score', 0),
+            key=lambda x: x.relevance_score,
             reverse=True
         )[:limit]
 
@@ -152,14 +152,14 @@ class WhatsAppNotifier:
 
         return self.send_message(message)
 
-    def send_quick_summary(self, articles: List[Dict]) -> bool:
+    def send_quick_summary(self, articles: List[ArticleRecord]) -> bool:
         """Send a quick summary (titles only)"""
         message = f"📰 *Quick News Update*\n{'=' * 40}\n\n"
 
         for i, article in enumerate(articles[:10], 1):
-            message += f"{i}. {article['title']}\n"
-            message += f"   ⭐ {article['relevance_score']}/100 | {article['source']}\n"
-            message += f"   🔗 {article['url']}\n\n"
+            message += f"{i}. {article.title}\n"
+            message += f"   ⭐ {article.relevance_score}/100 | {article.source}\n"
+            message += f"   🔗 {article.url}\n\n"
 
         return self.send_message(message)
 
@@ -172,15 +172,15 @@ if __name__ == "__main__":
     notifier = WhatsAppNotifier()
 
     test_articles = [
-        {
-            "title": "Test Article 1",
-            "source": "TechCrunch",
-            "relevance_score": 85,
-            "subtopic": "AI",
-            "summary": "This is a test summary of the article.",
-            "key_points": json.dumps(["Point 1", "Point 2", "Point 3"]),
-            "url": "https://example.com/article1"
-        }
+        ArticleRecord(
+            title="Test Article 1",
+            source="TechCrunch",
+            relevance_score=85,
+            subtopic="AI",
+            summary="This is a test summary of the article.",
+            key_points=["Point 1", "Point 2", "Point 3"],
+            url="https://example.com/article1"
+        )
     ]
 
     notifier.send_daily_digest(test_articles)